@@ -0,0 +1,43 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Importing this puts the checkout it lives in first on sys.path, so that
+`python benchmarks/bench_x.py` measures this tree's taskgroup rather than
+an installed one: import it before taskgroup.
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+
+def argument_parser(doc, *, with_json=True):
+    """An ArgumentParser described by the first line of a script's docstring.
+
+    Unless with_json is False it has the --json flag, see dump_json().
+    """
+    lines = (doc or "").strip().splitlines()
+    parser = argparse.ArgumentParser(description=lines[0] if lines else None)
+    if with_json:
+        parser.add_argument("--json", action="store_true", help="print machine readable results")
+    return parser
+
+
+def best_time(fn, repeat=3):
+    """The shortest of repeat timed calls of fn(), in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def dump_json(results):
+    """Print results as the document run_all.py collects from --json."""
+    json.dump({"python": sys.version, "results": results}, sys.stdout, indent=2)
+    print()
@@ -0,0 +1,74 @@
+"""
+Steps per second of a task started with and without an explicit context.
+
+taskgroup.tasks.Task passes context= straight to asyncio.Task where the
+interpreter supports it (3.11+). The "interceptor" row forces the 3.10
+path, where every send()/throw() is routed through context.run().
+
+    python benchmarks/bench_context.py [--steps N] [--json]
+"""
+
+import asyncio
+import contextvars
+
+import _common  # before taskgroup, see there
+
+from taskgroup.tasks import Task, _Interceptor
+
+
+async def _steps(n):
+    for _ in range(n):
+        await asyncio.sleep(0)
+
+
+def _no_context(loop, coro):
+    return Task(coro, loop=loop)
+
+
+def _context(loop, coro):
+    return Task(coro, loop=loop, context=contextvars.copy_context())
+
+
+def _interceptor(loop, coro):
+    return asyncio.Task(_Interceptor(coro, contextvars.copy_context()), loop=loop)
+
+
+BENCHMARKS = {
+    "Task()": _no_context,
+    "Task(context=...)": _context,
+    "interceptor (3.10 path)": _interceptor,
+}
+
+
+def _time(factory, steps):
+    loop = asyncio.new_event_loop()
+    try:
+        # a new coroutine each time, run on one loop so that creating the
+        # loop is not timed
+        return _common.best_time(lambda: loop.run_until_complete(factory(loop, _steps(steps))))
+    finally:
+        loop.close()
+
+
+def run(steps):
+    return {
+        name: {"steps_per_second": steps / _time(factory, steps)}
+        for name, factory in BENCHMARKS.items()
+    }
+
+
+def main(argv=None):
+    parser = _common.argument_parser(__doc__)
+    parser.add_argument("--steps", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    results = run(args.steps)
+    if args.json:
+        _common.dump_json(results)
+        return
+    for name, r in results.items():
+        print(f"{name:>24}: {r['steps_per_second']:12,.0f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Hot path benchmarks for TaskGroup and timeout(), compared with asyncio.
+
+Every benchmark runs the same workload through taskgroup and, where the
+interpreter has them (3.11+), through asyncio.TaskGroup and
+asyncio.timeout(), in a fresh asyncio.run() each time. The main task is
+therefore a plain asyncio.Task, which on 3.10 is what makes TaskGroup and
+timeout() swap it for a WrapCoro task on entry.
+
+    spawn            create_task() and completion of trivial children
+    start_soon       the same through start_soon() lightweight children
+    timeout          timeout() enter/exit without expiry
+    timeout expiry   timeout() that expires and raises TimeoutError
+    move_on expiry   move_on_after() that expires without raising
+    nested enter     entering a TaskGroup inside a TaskGroup
+    uncancel swap    install_uncancel() enter/exit (the 3.10 WrapCoro swap)
+    abort            aborting a group of parked children
+
+    python benchmarks/bench_hotpaths.py [--scale X] [--repeat N] [--json]
+"""
+
+import asyncio
+import sys
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import _common  # before taskgroup, see there
+
+import taskgroup
+from taskgroup import install
+
+
+async def _noop():
+    pass
+
+
+def _spawn(TaskGroup):
+    async def bench(n):
+        async with TaskGroup() as tg:
+            for _ in range(n):
+                tg.create_task(_noop())
+    return bench
+
+
+async def _start_soon(n):
+    async with taskgroup.TaskGroup() as tg:
+        for _ in range(n):
+            tg.start_soon(_noop())
+
+
+def _timeout(timeout):
+    async def bench(n):
+        for _ in range(n):
+            async with timeout(3600):
+                pass
+    return bench
+
+
+def _timeout_expiry(timeout):
+    async def bench(n):
+        for _ in range(n):
+            try:
+                async with timeout(0):
+                    await asyncio.sleep(1)
+            except TimeoutError:
+                pass
+    return bench
+
+
+async def _move_on_expiry(n):
+    for _ in range(n):
+        async with taskgroup.move_on_after(0):
+            await asyncio.sleep(1)
+
+
+def _nested_enter(TaskGroup):
+    async def bench(n):
+        async with TaskGroup():
+            for _ in range(n):
+                async with TaskGroup():
+                    pass
+    return bench
+
+
+async def _uncancel_swap(n):
+    for _ in range(n):
+        async with install.install_uncancel():
+            pass
+
+
+class _Abort(Exception):
+    pass
+
+
+def _abort(TaskGroup):
+    async def bench(n):
+        try:
+            async with TaskGroup() as tg:
+                for _ in range(n):
+                    tg.create_task(asyncio.sleep(3600))
+                # let every child park before timing the abort
+                await asyncio.sleep(0)
+                raise _Abort
+        except BaseException:
+            pass
+    return bench
+
+
+_Bench = Callable[[int], Coroutine[Any, Any, None]]
+
+# name -> (unit, base size, taskgroup implementation, asyncio implementation)
+BENCHMARKS: dict[str, tuple[str, int, _Bench, _Bench | None]] = {
+    "spawn": ("tasks", 100_000, _spawn(taskgroup.TaskGroup), None),
+    "start_soon": ("tasks", 100_000, _start_soon, None),
+    "timeout": ("enters", 100_000, _timeout(taskgroup.timeout), None),
+    "timeout expiry": ("timeouts", 20_000, _timeout_expiry(taskgroup.timeout), None),
+    "move_on expiry": ("timeouts", 20_000, _move_on_expiry, None),
+    "nested enter": ("enters", 100_000, _nested_enter(taskgroup.TaskGroup), None),
+    "uncancel swap": ("enters", 100_000, _uncancel_swap, None),
+    "abort": ("tasks", 100_000, _abort(taskgroup.TaskGroup), None),
+}
+
+if sys.version_info >= (3, 11):
+    for _name, _factory, _arg in (
+        ("spawn", _spawn, asyncio.TaskGroup),
+        ("timeout", _timeout, asyncio.timeout),
+        ("timeout expiry", _timeout_expiry, asyncio.timeout),
+        ("nested enter", _nested_enter, asyncio.TaskGroup),
+        ("abort", _abort, asyncio.TaskGroup),
+    ):
+        _unit, _size, _impl, _ = BENCHMARKS[_name]
+        BENCHMARKS[_name] = (_unit, _size, _impl, _factory(_arg))
+
+
+def _time(fn, n, repeat):
+    return _common.best_time(lambda: asyncio.run(fn(n)), repeat)
+
+
+def run(scale=1.0, repeat=3, names=None):
+    results = {}
+    for name, (unit, size, impl, stdlib) in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        n = max(1, int(size * scale))
+        result = {"unit": unit, "n": n, "taskgroup": n / _time(impl, n, repeat), "asyncio": None}
+        if stdlib is not None:
+            result["asyncio"] = n / _time(stdlib, n, repeat)
+        results[name] = result
+    return results
+
+
+def main(argv=None):
+    parser = _common.argument_parser(__doc__)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every workload size")
+    parser.add_argument("--repeat", type=int, default=3, help="report the best of this many runs")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run, of: {', '.join(BENCHMARKS)}")
+    args = parser.parse_args(argv)
+
+    results = run(args.scale, args.repeat, args.names)
+    if args.json:
+        _common.dump_json(results)
+        return
+    for name, r in results.items():
+        line = f"{name:>15}: {r['taskgroup']:12,.0f} {r['unit']}/s"
+        if r["asyncio"] is not None:
+            line += f"  asyncio {r['asyncio']:12,.0f} {r['unit']}/s  ({r['taskgroup'] / r['asyncio']:.2f}x)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Per-step and enter/exit overhead of TaskGroup and timeout().
+
+On 3.11+ TaskGroup and Timeout use the native asyncio.Task cancellation
+counting, so a task running inside them should step as fast as a bare
+asyncio task. The "backport" rows force the 3.10 install_uncancel() path,
+which moves the running coroutine into a WrapCoro task and adds a
+context.run() to every step.
+
+    python benchmarks/bench_passthrough.py [--steps N] [--json]
+"""
+
+import asyncio
+import sys
+
+import _common  # before taskgroup, see there
+
+import taskgroup
+from taskgroup import install
+
+
+async def _steps(n):
+    for _ in range(n):
+        await asyncio.sleep(0)
+
+
+async def _bare(n):
+    await _steps(n)
+
+
+async def _in_taskgroup(n):
+    async with taskgroup.TaskGroup():
+        await _steps(n)
+
+
+async def _in_timeout(n):
+    async with taskgroup.timeout(3600):
+        await _steps(n)
+
+
+async def _in_backport(n):
+    async with install.install_uncancel():
+        await _steps(n)
+
+
+async def _enter_taskgroup(n):
+    for _ in range(n):
+        async with taskgroup.TaskGroup():
+            pass
+
+
+async def _enter_timeout(n):
+    for _ in range(n):
+        async with taskgroup.timeout(3600):
+            pass
+
+
+async def _enter_backport(n):
+    for _ in range(n):
+        async with install.install_uncancel():
+            pass
+
+
+STEP_BENCHMARKS = {
+    "bare task": _bare,
+    "TaskGroup body": _in_taskgroup,
+    "timeout body": _in_timeout,
+    "backport body": _in_backport,
+}
+
+ENTER_BENCHMARKS = {
+    "TaskGroup enter/exit": _enter_taskgroup,
+    "timeout enter/exit": _enter_timeout,
+    "backport enter/exit": _enter_backport,
+}
+
+if sys.version_info >= (3, 11):
+    async def _in_stdlib_taskgroup(n):
+        async with asyncio.TaskGroup():
+            await _steps(n)
+
+    async def _enter_stdlib_taskgroup(n):
+        for _ in range(n):
+            async with asyncio.TaskGroup():
+                pass
+
+    async def _enter_stdlib_timeout(n):
+        for _ in range(n):
+            async with asyncio.timeout(3600):
+                pass
+
+    STEP_BENCHMARKS["asyncio.TaskGroup body"] = _in_stdlib_taskgroup
+    ENTER_BENCHMARKS["asyncio.TaskGroup enter/exit"] = _enter_stdlib_taskgroup
+    ENTER_BENCHMARKS["asyncio.timeout enter/exit"] = _enter_stdlib_timeout
+
+
+def _time(fn, n):
+    # asyncio.run, not taskgroup.run: the main task must be a plain
+    # asyncio.Task for the backport rows to take the WrapCoro path
+    return _common.best_time(lambda: asyncio.run(fn(n)))
+
+
+def run(steps):
+    results = {}
+    for name, fn in STEP_BENCHMARKS.items():
+        results[name] = {"ops_per_second": steps / _time(fn, steps), "unit": "steps"}
+    for name, fn in ENTER_BENCHMARKS.items():
+        results[name] = {"ops_per_second": steps / _time(fn, steps), "unit": "enters"}
+    return results
+
+
+def main(argv=None):
+    parser = _common.argument_parser(__doc__)
+    parser.add_argument("--steps", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    results = run(args.steps)
+    if args.json:
+        _common.dump_json(results)
+        return
+    for name, r in results.items():
+        print(f"{name:>30}: {r['ops_per_second']:12,.0f} {r['unit']}/s")
+
+
+if __name__ == "__main__":
+    main()
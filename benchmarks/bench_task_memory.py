@@ -0,0 +1,127 @@
+"""
+Per-task memory and create/complete throughput of taskgroup.tasks.Task.
+
+Memory is measured with tracemalloc over tasks parked on a shared future,
+so it includes the coroutine frame and the done callback the future holds.
+Throughput creates tasks for coroutines that return immediately and runs
+the loop until all of them are done.
+
+"dict Task" reproduces the previous layout: a subclass that keeps its
+cancellation counter in an instance __dict__ and overrides cancel() in
+python.
+
+"shared context" (3.11+) is what TaskGroup(context_policy="shared") does:
+every task is given the same Context instead of copying one per task.
+
+    python benchmarks/bench_task_memory.py [--tasks N] [--parked N] [--json]
+"""
+
+import asyncio
+import contextvars
+import gc
+import sys
+import time
+import tracemalloc
+
+import _common  # before taskgroup, see there
+
+from taskgroup.tasks import Task
+
+
+class DictTask(asyncio.Task):
+    def __init__(self, *args, **kwargs):
+        self._cancels = 0
+        super().__init__(*args, **kwargs)
+
+    def cancel(self, *args, **kwargs):
+        if not self.done():
+            self._cancels += 1
+        return super().cancel(*args, **kwargs)
+
+
+def _shared_context_task(coro, *, loop, _context=contextvars.copy_context()):
+    return Task(coro, loop=loop, context=_context)
+
+
+BENCHMARKS = {
+    "asyncio.Task": asyncio.Task,
+    "taskgroup Task": Task,
+    "dict Task": DictTask,
+}
+
+if sys.version_info >= (3, 11):
+    BENCHMARKS["shared context"] = _shared_context_task
+
+
+async def _park(fut):
+    await fut
+
+
+async def _noop():
+    pass
+
+
+def _bytes_per_task(cls, n):
+    loop = asyncio.new_event_loop()
+    try:
+        fut = loop.create_future()
+        coros = [_park(fut) for _ in range(n)]
+        gc.collect()
+        tracemalloc.start()
+        tasks = [cls(coro, loop=loop) for coro in coros]
+        # run every first step so each task is parked on fut
+        loop.run_until_complete(asyncio.sleep(0))
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        fut.set_result(None)
+        loop.run_until_complete(asyncio.gather(*tasks))
+        # the list of tasks itself is 8 bytes per entry
+        return used / n - 8
+    finally:
+        loop.close()
+
+
+def _tasks_per_second(cls, n):
+    loop = asyncio.new_event_loop()
+    try:
+        async def main():
+            tasks = [cls(_noop(), loop=loop) for _ in range(n)]
+            for task in tasks:
+                await task
+
+        start = time.perf_counter()
+        loop.run_until_complete(main())
+        return n / (time.perf_counter() - start)
+    finally:
+        loop.close()
+
+
+def run(n, parked):
+    return {
+        name: {
+            "bytes_per_task": _bytes_per_task(cls, parked),
+            "tasks_per_second": _tasks_per_second(cls, n),
+        }
+        for name, cls in BENCHMARKS.items()
+    }
+
+
+def main(argv=None):
+    parser = _common.argument_parser(__doc__)
+    parser.add_argument("--tasks", type=int, default=1_000_000, help="tasks for the throughput run")
+    parser.add_argument("--parked", type=int, default=100_000, help="tasks for the memory run")
+    args = parser.parse_args(argv)
+
+    results = run(args.tasks, args.parked)
+    if args.json:
+        _common.dump_json(results)
+        return
+    for name, r in results.items():
+        print(
+            f"{name:>16}: {r['bytes_per_task']:8,.0f} bytes/task"
+            f"  {r['tasks_per_second']:12,.0f} tasks/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
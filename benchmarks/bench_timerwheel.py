@@ -0,0 +1,72 @@
+"""
+Compare Timeout on the loop's heap against the shared TimerWheel.
+
+Runs many concurrent tasks that each repeatedly enter and exit a
+timeout() that never expires, and reschedule it once per iteration,
+which is the pattern of per-request deadlines in a busy server.
+
+    python benchmarks/bench_timerwheel.py [--tasks N] [--iterations N] [--json]
+"""
+
+import asyncio
+import time
+
+import _common  # before taskgroup, see there
+
+import taskgroup
+from taskgroup import timerwheel
+
+
+async def _worker(iterations, scheduled, loop):
+    for _ in range(iterations):
+        async with taskgroup.timeout(30) as cm:
+            cm.reschedule(loop.time() + 60)
+            await asyncio.sleep(0)
+    scheduled.append(len(loop._scheduled))  # type: ignore
+
+
+async def _main(tasks, iterations, wheel):
+    loop = asyncio.get_running_loop()
+    if wheel:
+        timerwheel.install_timer_wheel(loop)
+    scheduled = []
+    start = time.perf_counter()
+    async with taskgroup.TaskGroup() as tg:
+        for _ in range(tasks):
+            tg.create_task(_worker(iterations, scheduled, loop))
+    elapsed = time.perf_counter() - start
+    return elapsed, max(scheduled)
+
+
+def run(tasks, iterations):
+    results = {}
+    for name, wheel in (("heap", False), ("wheel", True)):
+        elapsed, heap_size = asyncio.run(_main(tasks, iterations, wheel))
+        ops = tasks * iterations
+        results[name] = {
+            "seconds": elapsed,
+            "timeouts_per_second": ops / elapsed,
+            "peak_loop_heap": heap_size,
+        }
+    return results
+
+
+def main(argv=None):
+    parser = _common.argument_parser(__doc__)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    results = run(args.tasks, args.iterations)
+    if args.json:
+        _common.dump_json(results)
+        return
+    for name, r in results.items():
+        print(
+            f"{name:>6}: {r['timeouts_per_second']:12,.0f} timeouts/s"
+            f"  {r['seconds']:.3f}s  peak loop heap {r['peak_loop_heap']:,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Run every benchmarks/bench_*.py script and merge their JSON output.
+
+Each script runs in its own interpreter so they cannot disturb each other.
+The combined document is meant to be stored per release and diffed:
+
+    {"python": ..., "taskgroup": ..., "benchmarks": {"bench_x": {...}, ...}}
+
+    python benchmarks/run_all.py [-o results.json] [bench_x ...]
+"""
+
+import json
+import os
+import pathlib
+import subprocess
+import sys
+
+import _common  # before taskgroup, see there
+
+import taskgroup
+
+HERE = pathlib.Path(__file__).resolve().parent
+
+
+def run(names=None):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(HERE.parent), env.get("PYTHONPATH")]))
+    benchmarks = {}
+    for script in sorted(HERE.glob("bench_*.py")):
+        if names and script.stem not in names:
+            continue
+        print(f"running {script.stem}", file=sys.stderr)
+        out = subprocess.run(
+            [sys.executable, str(script), "--json"],
+            env=env, check=True, stdout=subprocess.PIPE, text=True,
+        ).stdout
+        benchmarks[script.stem] = json.loads(out)["results"]
+    return benchmarks
+
+
+def main(argv=None):
+    parser = _common.argument_parser(__doc__, with_json=False)
+    parser.add_argument("-o", "--output", help="write the results here instead of stdout")
+    parser.add_argument("names", nargs="*", help="bench_* scripts to run, default all")
+    args = parser.parse_args(argv)
+
+    document = {
+        "python": sys.version,
+        "taskgroup": taskgroup.__version__,
+        "benchmarks": run(args.names),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,12 @@ backport of asyncio.TaskGroup, asyncio.Runner and asyncio.timeout
 
 __version__ = "0.0.0a4"
 
-__all__ = ["run", "Runner", "TaskGroup", "Timeout", "timeout", "timeout_at"]
+__all__ = ["run", "Runner", "RunnerPool", "Supervisor", "TaskGroup", "Timeout", "timeout", "timeout_at", "move_on_after", "move_on_at", "eager_task_factory", "priority_loop_factory"]
 
+from .pool import RunnerPool
 from .runners import run, Runner
+from .scheduler import priority_loop_factory
+from .supervisor import Supervisor
 from .taskgroups import TaskGroup
-from .timeouts import Timeout, timeout, timeout_at
+from .tasks import eager_task_factory
+from .timeouts import Timeout, move_on_after, move_on_at, timeout, timeout_at
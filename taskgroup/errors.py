@@ -0,0 +1,182 @@
+"""
+bounded aggregation of TaskGroup child errors
+"""
+
+from __future__ import annotations
+
+__all__ = ["ErrorPolicy", "KeepFirst", "Deduplicate", "Summarize"]
+
+import abc
+import sys
+from typing import Hashable
+
+from exceptiongroup import BaseExceptionGroup
+
+_MESSAGE = 'unhandled errors in a TaskGroup'
+
+
+def _add_note(exc: BaseException, note: str) -> None:
+    if sys.version_info >= (3, 11):
+        exc.add_note(note)
+    else:
+        # understood by the exceptiongroup backport's traceback formatting
+        exc.__notes__ = [*getattr(exc, "__notes__", ()), note]  # type: ignore[attr-defined]
+
+
+class ErrorPolicy(abc.ABC):
+    """Decides which child errors a TaskGroup keeps for its exception group.
+
+    By default a TaskGroup keeps every error. With a policy the group
+    holds a bounded number of exceptions however many children fail, and
+    still raises a BaseExceptionGroup, so except* and exceptiongroup.catch()
+    work as usual on the errors that were kept.
+
+    A policy object can be shared by any number of groups: each group
+    gets its own collector from collector().
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def collector(self) -> ErrorCollector:
+        ...
+
+
+class ErrorCollector(abc.ABC):
+    """Per-group error state created by an ErrorPolicy."""
+
+    __slots__ = ("total",)
+
+    def __init__(self) -> None:
+        self.total = 0
+
+    def __len__(self) -> int:
+        return self.total
+
+    def append(self, exc: BaseException) -> None:
+        self.total += 1
+
+    @abc.abstractmethod
+    def exception_group(self) -> BaseExceptionGroup:
+        ...
+
+
+class KeepFirst(ErrorPolicy):
+    """Keep the first n errors and count the rest."""
+
+    __slots__ = ("n",)
+
+    def __init__(self, n: int = 10) -> None:
+        if n < 1:
+            raise ValueError(f"n must be >= 1, got {n!r}")
+        self.n = n
+
+    def __repr__(self) -> str:
+        return f"KeepFirst({self.n})"
+
+    def collector(self) -> ErrorCollector:
+        return _KeepFirstCollector(self.n)
+
+
+class _KeepFirstCollector(ErrorCollector):
+    __slots__ = ("_n", "_errors")
+
+    def __init__(self, n: int) -> None:
+        super().__init__()
+        self._n = n
+        self._errors: list[BaseException] = []
+
+    def append(self, exc: BaseException) -> None:
+        self.total += 1
+        if len(self._errors) < self._n:
+            self._errors.append(exc)
+
+    def exception_group(self) -> BaseExceptionGroup:
+        dropped = self.total - len(self._errors)
+        message = f'{_MESSAGE} ({dropped} more not kept)' if dropped else _MESSAGE
+        return BaseExceptionGroup(message, self._errors)
+
+
+def _signature(exc: BaseException) -> Hashable:
+    tb = exc.__traceback__
+    frames = []
+    while tb is not None:
+        frames.append((tb.tb_frame.f_code, tb.tb_lineno))
+        tb = tb.tb_next
+    return type(exc), tuple(frames)
+
+
+class Deduplicate(ErrorPolicy):
+    """Keep one error per exception type and traceback, with a count.
+
+    Errors raised by the same line through the same call path are
+    considered duplicates; the kept one gets a note with how many times it
+    was seen. At most max_distinct different errors are kept, further new
+    ones are only counted.
+    """
+
+    __slots__ = ("max_distinct",)
+
+    def __init__(self, max_distinct: int = 100) -> None:
+        if max_distinct < 1:
+            raise ValueError(f"max_distinct must be >= 1, got {max_distinct!r}")
+        self.max_distinct = max_distinct
+
+    def __repr__(self) -> str:
+        return f"Deduplicate(max_distinct={self.max_distinct})"
+
+    def collector(self) -> ErrorCollector:
+        return _DedupCollector(self.max_distinct, _signature, keep_traceback=True)
+
+
+class Summarize(ErrorPolicy):
+    """Keep one error per exception type, without its traceback.
+
+    Only the count of each type and a traceback-free exemplar to match
+    except* against are kept, the cheapest option for very large fan-outs.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "Summarize()"
+
+    def collector(self) -> ErrorCollector:
+        return _DedupCollector(None, type, keep_traceback=False)
+
+
+class _DedupCollector(ErrorCollector):
+    __slots__ = ("_max_distinct", "_key", "_keep_traceback", "_seen", "_dropped")
+
+    def __init__(self, max_distinct, key, *, keep_traceback: bool) -> None:
+        super().__init__()
+        self._max_distinct = max_distinct
+        self._key = key
+        self._keep_traceback = keep_traceback
+        # signature -> [exemplar, count]
+        self._seen: dict[Hashable, list] = {}
+        self._dropped = 0
+
+    def append(self, exc: BaseException) -> None:
+        self.total += 1
+        key = self._key(exc)
+        entry = self._seen.get(key)
+        if entry is not None:
+            entry[1] += 1
+        elif self._max_distinct is not None and len(self._seen) >= self._max_distinct:
+            self._dropped += 1
+        else:
+            if not self._keep_traceback:
+                exc = exc.with_traceback(None)
+            self._seen[key] = [exc, 1]
+
+    def exception_group(self) -> BaseExceptionGroup:
+        errors = []
+        for exc, count in self._seen.values():
+            if count > 1:
+                _add_note(exc, f"raised by {count} tasks")
+            errors.append(exc)
+        message = f'{_MESSAGE} ({self.total} errors, {len(errors)} distinct kept'
+        if self._dropped:
+            message += f', {self._dropped} not kept'
+        return BaseExceptionGroup(message + ')', errors)
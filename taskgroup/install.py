@@ -1,9 +1,18 @@
+# only imported on python 3.10, where asyncio.Task has no cancelling()
+# and uncancel(): TaskGroup and Timeout run inside install_uncancel() there
+
 import asyncio
-import collections.abc
 import contextlib
+import sys
 import types
 
-from .tasks import task_factory as _task_factory, Task as _Task
+from .tasks import task_factory as _task_factory, Task as _Task, _Wrapper
+
+if sys.version_info < (3, 12):
+    from .tasks import EagerTask as _EagerTask
+    _UNCANCEL_TASK_TYPES = (_Task, _EagerTask)
+else:
+    _UNCANCEL_TASK_TYPES = (_Task,)
 
 
 UNCANCEL_DONE = object()
@@ -37,20 +46,13 @@ def _async_yield(v):
     return (yield v)
 
 
-class WrapCoro(collections.abc.Coroutine):
+class WrapCoro(_Wrapper):
+    # a _Wrapper so that the swapped task's coroutine can still be
+    # introspected, as taskgroup.tree does
     def __init__(self, coro, context):
         self._coro = coro
         self._context = context
 
-    def __await__(self):
-        return self
-
-    def __iter__(self):
-        return self
-
-    def __next__(self):
-        return self.send(None)
-
     def throw(self, *exc_info):
         result = self._context.run(self._coro.throw, *exc_info)
         if result is UNCANCEL_DONE:
@@ -66,7 +68,7 @@ class WrapCoro(collections.abc.Coroutine):
 
 @contextlib.asynccontextmanager
 async def install_uncancel():
-    if isinstance(asyncio.current_task(), _Task):
+    if isinstance(asyncio.current_task(), _UNCANCEL_TASK_TYPES):
         # already installed
         yield
         return
@@ -99,3 +101,32 @@ async def install_uncancel():
     finally:
         # tell our WrapCoro that trio is done
         await _async_yield(UNCANCEL_DONE)
+
+
+def wrap_uncancel(cls):
+    """Run the body of cls's async context manager inside install_uncancel()."""
+    aenter = cls.__aenter__
+    aexit = cls.__aexit__
+
+    async def __aenter__(self):
+        cmgr = install_uncancel()
+        await cmgr.__aenter__()
+        try:
+            result = await aenter(self)
+        except BaseException:
+            await cmgr.__aexit__(None, None, None)
+            raise
+        self._uncancel_cmgr = cmgr
+        return result
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        cmgr = self._uncancel_cmgr
+        del self._uncancel_cmgr
+        try:
+            return await aexit(self, exc_type, exc_val, exc_tb)
+        finally:
+            await cmgr.__aexit__(None, None, None)
+
+    cls.__aenter__ = __aenter__
+    cls.__aexit__ = __aexit__
+    return cls
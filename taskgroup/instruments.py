@@ -0,0 +1,108 @@
+"""
+lifecycle hooks for TaskGroup
+"""
+
+from __future__ import annotations
+
+__all__ = ["Instrument", "TaskGroupStats", "add_instrument", "remove_instrument"]
+
+import asyncio
+import bisect
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .taskgroups import TaskGroup
+
+# instruments every TaskGroup created from now on reports to
+_instruments: list[Instrument] = []
+
+
+class Instrument:
+    """Base class for TaskGroup instruments.
+
+    Override the hooks you need; they are called synchronously on the
+    event loop, so keep them cheap. A hook that raises is reported to the
+    loop's exception handler and does not disturb the TaskGroup.
+
+    Instruments are looked up when a TaskGroup is created: a group with
+    no instruments pays only an empty-tuple check on each event.
+    """
+
+    __slots__ = ()
+
+    def task_spawned(self, group: TaskGroup, task: asyncio.Task) -> None:
+        """Called from create_task() for every new child."""
+
+    def task_done(self, group: TaskGroup, task: asyncio.Task) -> None:
+        """Called when a child finishes, was cancelled or failed."""
+
+    def group_aborting(self, group: TaskGroup) -> None:
+        """Called when the group starts cancelling its children."""
+
+    def group_draining(self, group: TaskGroup, pending: int) -> None:
+        """Called from __aexit__ each time it waits for pending children."""
+
+
+def add_instrument(instrument: Instrument) -> None:
+    """Report every TaskGroup created from now on to instrument."""
+    if instrument not in _instruments:
+        _instruments.append(instrument)
+
+
+def remove_instrument(instrument: Instrument) -> None:
+    """Stop reporting newly created TaskGroups to instrument."""
+    _instruments.remove(instrument)
+
+
+class TaskGroupStats(Instrument):
+    """Counters and a time-to-completion histogram for TaskGroup children.
+
+    One instance can be shared by many groups to aggregate them, or passed
+    to a single TaskGroup(instruments=...) for per-group numbers.
+
+    histogram[i] counts children that finished within buckets[i] seconds
+    of being spawned (and after buckets[i - 1]); the last entry counts
+    the rest.
+    """
+
+    __slots__ = ("spawned", "completed", "failed", "cancelled", "aborts", "buckets", "histogram", "_started")
+
+    def __init__(self, buckets: Sequence[float] = (0.001, 0.01, 0.1, 1.0, 10.0)) -> None:
+        self.spawned = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.aborts = 0
+        self.buckets = tuple(buckets)
+        self.histogram = [0] * (len(self.buckets) + 1)
+        self._started: dict[asyncio.Task, float] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"<TaskGroupStats spawned={self.spawned} in_flight={self.in_flight} "
+            f"completed={self.completed} failed={self.failed} cancelled={self.cancelled}>"
+        )
+
+    @property
+    def in_flight(self) -> int:
+        return self.spawned - self.completed - self.failed - self.cancelled
+
+    def task_spawned(self, group: TaskGroup, task: asyncio.Task) -> None:
+        self.spawned += 1
+        self._started[task] = task.get_loop().time()
+
+    def task_done(self, group: TaskGroup, task: asyncio.Task) -> None:
+        started = self._started.pop(task, None)
+        if started is not None:
+            elapsed = task.get_loop().time() - started
+            self.histogram[bisect.bisect_left(self.buckets, elapsed)] += 1
+        if task.cancelled():
+            self.cancelled += 1
+        elif task.exception() is not None:
+            self.failed += 1
+        else:
+            self.completed += 1
+
+    def group_aborting(self, group: TaskGroup) -> None:
+        self.aborts += 1
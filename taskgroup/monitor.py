@@ -0,0 +1,187 @@
+"""
+event loop lag and slow step monitoring for Runner
+"""
+
+from __future__ import annotations
+
+__all__ = ["LoopMonitor", "LagStats", "SlowStep"]
+
+import sys
+import threading
+from asyncio import AbstractEventLoop, events, tasks
+from collections.abc import Callable
+from typing import NamedTuple, Optional
+
+
+class LagStats(NamedTuple):
+    """Event loop lag percentiles, in seconds, over one report interval."""
+    samples: int
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+
+class SlowStep(NamedTuple):
+    """A single step that kept the event loop from running its heartbeat."""
+    duration: float
+    task_name: Optional[str]
+    coro: Optional[str]
+    location: Optional[str]
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class LoopMonitor:
+    """Low overhead monitor of event loop responsiveness.
+
+    A heartbeat callback runs every interval seconds on the loop; how late
+    it runs is the loop lag. Every report_interval seconds on_lag is called
+    with the lag percentiles.
+
+    A watchdog thread checks the heartbeat. When it is more than
+    slow_step_threshold seconds overdue, the thread records which task
+    step is running, and where, while it is still blocking the loop.
+    on_slow_step is called with a SlowStep on the loop thread once the
+    loop has recovered.
+
+    Unlike loop.set_debug(True) this costs one timer per interval and a
+    thread that mostly sleeps, so it can stay enabled in production.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = 0.05,
+        slow_step_threshold: float = 0.1,
+        report_interval: float = 10.0,
+        on_lag: Callable[[LagStats], object] | None = None,
+        on_slow_step: Callable[[SlowStep], object] | None = None,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError(f"interval must be > 0, got {interval!r}")
+        if slow_step_threshold <= 0:
+            raise ValueError(f"slow_step_threshold must be > 0, got {slow_step_threshold!r}")
+        self._interval = interval
+        self._threshold = slow_step_threshold
+        self._report_interval = report_interval
+        self._on_lag = on_lag
+        self._on_slow_step = on_slow_step
+        self._loop: AbstractEventLoop | None = None
+        self._thread_id: int | None = None
+        self._heartbeat: events.TimerHandle | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._samples: list[float] = []
+        self._next_beat = 0.0
+        self._next_report = 0.0
+        # written by the watchdog, read and cleared on the loop
+        self._slow_step: SlowStep | None = None
+        self._reported_beat = 0.0
+
+    def __repr__(self) -> str:
+        state = "running" if self._loop is not None else "stopped"
+        return f"<LoopMonitor {state} interval={self._interval} slow_step_threshold={self._threshold}>"
+
+    def start(self, loop: AbstractEventLoop) -> None:
+        """Start monitoring loop; must be called from the loop's thread."""
+        if self._loop is not None:
+            raise RuntimeError(f"{self!r} is already started")
+        self._loop = loop
+        self._thread_id = threading.get_ident()
+        self._samples = []
+        self._slow_step = None
+        now = loop.time()
+        self._next_beat = now + self._interval
+        self._next_report = now + self._report_interval
+        self._heartbeat = loop.call_at(self._next_beat, self._beat)
+        self._stopping.clear()
+        if self._on_slow_step is not None:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="taskgroup-loop-monitor", daemon=True,
+            )
+            self._watchdog.start()
+
+    def stop(self) -> None:
+        """Stop monitoring and report the lag collected so far."""
+        if self._loop is None:
+            return
+        self._stopping.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        self._deliver_slow_step()
+        self._report()
+        self._loop = None
+
+    def _beat(self) -> None:
+        loop = self._loop
+        assert loop is not None
+        now = loop.time()
+        self._samples.append(max(0.0, now - self._next_beat))
+        self._deliver_slow_step()
+        if now >= self._next_report:
+            self._report()
+            self._next_report = now + self._report_interval
+        self._next_beat = now + self._interval
+        self._heartbeat = loop.call_at(self._next_beat, self._beat)
+
+    def _report(self) -> None:
+        samples = self._samples
+        if not samples or self._on_lag is None:
+            self._samples = []
+            return
+        self._samples = []
+        samples.sort()
+        self._on_lag(LagStats(
+            samples=len(samples),
+            p50=_percentile(samples, 0.5),
+            p90=_percentile(samples, 0.9),
+            p99=_percentile(samples, 0.99),
+            max=samples[-1],
+        ))
+
+    def _deliver_slow_step(self) -> None:
+        slow_step = self._slow_step
+        if slow_step is None or self._on_slow_step is None:
+            return
+        self._slow_step = None
+        assert self._loop is not None
+        # the watchdog saw the stall in progress, the heartbeat knows how
+        # long it really lasted
+        duration = max(slow_step.duration, self._loop.time() - self._next_beat)
+        self._on_slow_step(slow_step._replace(duration=duration))
+
+    def _watch(self) -> None:
+        loop = self._loop
+        assert loop is not None
+        check = min(self._interval, self._threshold) / 2
+        while not self._stopping.wait(check):
+            expected = self._next_beat
+            overdue = loop.time() - expected
+            if overdue <= self._threshold or expected == self._reported_beat:
+                continue
+            if not loop.is_running():
+                continue
+            self._reported_beat = expected
+            self._slow_step = self._capture(overdue)
+
+    def _capture(self, overdue: float) -> SlowStep:
+        assert self._loop is not None
+        task = tasks.current_task(self._loop)
+        task_name = coro_name = None
+        if task is not None:
+            task_name = task.get_name()
+            coro = task.get_coro()
+            coro_name = getattr(coro, "__qualname__", None) or type(coro).__name__
+        location = None
+        frame = sys._current_frames().get(self._thread_id)  # type: ignore
+        if frame is not None:
+            code = frame.f_code
+            location = f"{code.co_filename}:{frame.f_lineno} in {code.co_name}"
+        return SlowStep(duration=overdue, task_name=task_name, coro=coro_name, location=location)
@@ -0,0 +1,153 @@
+"""
+many lightweight TaskGroup children driven by a single task
+"""
+
+from __future__ import annotations
+
+import collections
+import contextvars
+import functools
+from asyncio import events, exceptions, futures, tasks
+from collections.abc import Coroutine
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .taskgroups import TaskGroup
+
+
+class _Child:
+    __slots__ = ("coro", "context", "waiter", "must_cancel")
+
+    def __init__(self, coro: Coroutine[Any, Any, Any], context: contextvars.Context) -> None:
+        self.coro = coro
+        self.context = context
+        self.waiter: futures.Future[Any] | None = None
+        self.must_cancel = False
+
+
+class Multiplexer:
+    """Steps the coroutines passed to TaskGroup.start_soon() from one task.
+
+    This does what asyncio.Task.__step does for each child, without a Task
+    per child: a child blocked on a future is resumed by that future's done
+    callback through the driver's ready queue, and the driver handles all
+    children that became ready since it last ran in one step of its own.
+
+    The driver is an ordinary child task of the group, so the group waits
+    for it, and aborting the group cancels it; it then cancels every child
+    it is driving and keeps driving them until they have all finished. A
+    child that raises is reported to the group as if a task had failed.
+    The driver finishes once it has no children left.
+    """
+
+    __slots__ = ("_group", "_loop", "_ready", "_live", "_wakeup", "_cancelling", "task")
+
+    def __init__(self, group: TaskGroup, loop: events.AbstractEventLoop) -> None:
+        self._group = group
+        self._loop = loop
+        self._ready: collections.deque[tuple[_Child, BaseException | None]] = collections.deque()
+        self._live: set[_Child] = set()
+        self._wakeup: futures.Future[None] | None = None
+        self._cancelling = False
+        self.task: tasks.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def start_soon(self, coro: Coroutine[Any, Any, Any], context: contextvars.Context) -> None:
+        child = _Child(coro, context)
+        self._live.add(child)
+        if self._cancelling:
+            child.must_cancel = True
+        self._schedule(child, None)
+
+    def _schedule(self, child: _Child, exc: BaseException | None) -> None:
+        self._ready.append((child, exc))
+        wakeup = self._wakeup
+        if wakeup is not None and not wakeup.done():
+            wakeup.set_result(None)
+
+    def _on_waiter_done(self, child: _Child, fut: futures.Future[Any]) -> None:
+        child.waiter = None
+        if fut.cancelled():
+            self._schedule(child, exceptions.CancelledError())
+        else:
+            self._schedule(child, None)
+
+    def on_driver_done(self, task: tasks.Task[None]) -> None:
+        if self._group._multiplexer is self:
+            self._group._multiplexer = None
+        # only if the driver was cancelled before it ever ran
+        for child in self._live:
+            child.coro.close()
+        self._live.clear()
+        self._ready.clear()
+
+    def _cancel_children(self) -> None:
+        self._cancelling = True
+        for child in self._live:
+            waiter = child.waiter
+            if waiter is None or not waiter.cancel():
+                child.must_cancel = True
+
+    async def drive(self) -> None:
+        while True:
+            # children made ready while this batch runs wait for the next
+            # one, so the driver never monopolises the loop
+            for _ in range(len(self._ready)):
+                child, exc = self._ready.popleft()
+                self._step(child, exc)
+            if self._ready:
+                try:
+                    await tasks.sleep(0)
+                except exceptions.CancelledError:
+                    self._cancel_children()
+                continue
+            if not self._live:
+                break
+            self._wakeup = self._loop.create_future()
+            try:
+                await self._wakeup
+            except exceptions.CancelledError:
+                self._cancel_children()
+            finally:
+                self._wakeup = None
+        # finished: the next start_soon() starts a new driver
+        self._group._multiplexer = None
+
+    def _step(self, child: _Child, exc: BaseException | None) -> None:
+        if child.must_cancel:
+            child.must_cancel = False
+            if not isinstance(exc, exceptions.CancelledError):
+                exc = exceptions.CancelledError()
+        coro = child.coro
+        try:
+            if exc is None:
+                result = child.context.run(coro.send, None)
+            else:
+                result = child.context.run(coro.throw, exc)
+        except StopIteration:
+            self._live.discard(child)
+            return
+        except exceptions.CancelledError:
+            self._live.discard(child)
+            return
+        except BaseException as e:
+            self._live.discard(child)
+            assert self.task is not None
+            self._group._child_failed(self.task, e)
+            return
+
+        blocking = getattr(result, "_asyncio_future_blocking", None)
+        if blocking:
+            result._asyncio_future_blocking = False
+            child.waiter = result
+            result.add_done_callback(functools.partial(self._on_waiter_done, child))
+            if child.must_cancel and result.cancel():
+                child.must_cancel = False
+        elif result is None:
+            # bare yield, as in asyncio.sleep(0)
+            self._schedule(child, None)
+        else:
+            self._schedule(child, RuntimeError(
+                f"Lightweight child got bad yield: {result!r}"))
@@ -0,0 +1,237 @@
+"""
+running blocking callables outside the event loop on behalf of a TaskGroup
+"""
+
+from __future__ import annotations
+
+__all__ = ["ThreadPool", "get_thread_pool", "get_process_pool"]
+
+import concurrent.futures
+import contextvars
+import os
+import threading
+from asyncio import exceptions, futures, tasks
+from collections.abc import Callable
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, NamedTuple, TypeVar
+
+_T = TypeVar("_T")
+
+# results at least this large come back through shared memory instead of
+# being pickled down the executor's pipe
+_SHM_THRESHOLD = 1 << 16
+
+_thread_pool: ThreadPool | None = None
+_process_pool: concurrent.futures.ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+class ThreadPool:
+    """A bounded pool of threads for TaskGroup.run_in_thread().
+
+    At most max_workers jobs run at once, the rest wait in the pool's queue
+    until a thread is free; a queued job whose task is cancelled is dropped
+    without running. queued and running are cheap to read, e.g. from a
+    metrics scrape.
+    """
+
+    def __init__(self, max_workers: int | None = None, *, thread_name_prefix: str = "taskgroup-thread") -> None:
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be >= 1, got {max_workers!r}")
+        self._max_workers = max_workers
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers, thread_name_prefix=thread_name_prefix,
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+
+    def __repr__(self) -> str:
+        return f"<ThreadPool max_workers={self._max_workers} running={self._running} queued={self._queued}>"
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @property
+    def running(self) -> int:
+        """Number of jobs currently running in a thread."""
+        return self._running
+
+    @property
+    def queued(self) -> int:
+        """Number of jobs waiting for a free thread."""
+        return self._queued
+
+    def submit(self, fn: Callable[..., _T], /, *args: Any) -> concurrent.futures.Future[_T]:
+        with self._lock:
+            self._queued += 1
+        try:
+            cfut = self._executor.submit(self._run, fn, args)
+        except BaseException:
+            with self._lock:
+                self._queued -= 1
+            raise
+        cfut.add_done_callback(self._on_done)
+        return cfut
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Drop queued jobs and stop the threads once running ones finish."""
+        self._executor.shutdown(wait, cancel_futures=True)
+
+    def _run(self, fn: Callable[..., _T], args: tuple[Any, ...]) -> _T:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _on_done(self, cfut: concurrent.futures.Future) -> None:
+        if cfut.cancelled():
+            # dropped before _run() got to it
+            with self._lock:
+                self._queued -= 1
+
+
+def get_thread_pool() -> ThreadPool:
+    """The thread pool run_in_thread() uses by default.
+
+    Created on first use with the same number of threads as
+    asyncio's default executor and shared by every TaskGroup in the
+    process.
+    """
+    global _thread_pool
+    with _pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPool()
+        return _thread_pool
+
+
+def get_process_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """The process pool create_process_task() uses by default.
+
+    Created on first use with the default number of workers and shared by
+    every TaskGroup in the process.
+    """
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is None:
+            _process_pool = concurrent.futures.ProcessPoolExecutor()
+        return _process_pool
+
+
+class _SharedResult(NamedTuple):
+    name: str
+    size: int
+    kind: type
+
+
+class _ViewResult(NamedTuple):
+    # memoryview cannot be pickled: a small one travels as bytes
+    data: bytes
+
+
+def _call_in_process(fn: Callable[..., Any], args: tuple[Any, ...]) -> Any:
+    # runs in the worker process
+    result = fn(*args)
+    kind = type(result)
+    if kind not in (bytes, bytearray, memoryview):
+        return result
+    view = memoryview(result)
+    if not view.c_contiguous:
+        view = memoryview(view.tobytes())
+    if view.nbytes < _SHM_THRESHOLD:
+        if kind is memoryview:
+            return _ViewResult(view.tobytes())
+        return result
+    shm = shared_memory.SharedMemory(create=True, size=view.nbytes)
+    try:
+        buf = shm.buf
+        assert buf is not None
+        buf[:view.nbytes] = view.cast("B")
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+    # the parent owns the segment from here on: stop this worker's
+    # resource tracker from unlinking it when the worker exits
+    resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    return _SharedResult(shm.name, view.nbytes, kind)
+
+
+def _collect(result: Any) -> Any:
+    if type(result) is _ViewResult:
+        return memoryview(result.data)
+    if type(result) is not _SharedResult:
+        return result
+    shm = shared_memory.SharedMemory(name=result.name)
+    try:
+        buf = shm.buf
+        assert buf is not None
+        data = buf[:result.size]
+        try:
+            if result.kind is bytes:
+                return bytes(data)
+            return result.kind(bytearray(data))
+        finally:
+            data.release()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _discard(fut: concurrent.futures.Future) -> None:
+    # an abandoned job finished after all: free its shared memory
+    if fut.cancelled() or fut.exception() is not None:
+        return
+    result = fut.result()
+    if type(result) is _SharedResult:
+        shm = shared_memory.SharedMemory(name=result.name)
+        shm.close()
+        shm.unlink()
+
+
+async def run_in_process(
+    executor: concurrent.futures.Executor | None,
+    fn: Callable[..., _T],
+    args: tuple[Any, ...],
+) -> _T:
+    if executor is None:
+        executor = get_process_pool()
+    cfut = executor.submit(_call_in_process, fn, args)
+    try:
+        result = await futures.wrap_future(cfut)
+    except exceptions.CancelledError:
+        # wrap_future() has already cancelled the job if it had not
+        # started; one that is running cannot be stopped, so it is
+        # abandoned and its result released when it arrives
+        cfut.add_done_callback(_discard)
+        raise
+    return _collect(result)
+
+
+async def run_in_thread(
+    pool: ThreadPool | None,
+    fn: Callable[..., _T],
+    args: tuple[Any, ...],
+    grace: float,
+) -> _T:
+    if pool is None:
+        pool = get_thread_pool()
+    context = contextvars.copy_context()
+    cfut: concurrent.futures.Future[_T] = pool.submit(context.run, fn, *args)
+    try:
+        return await futures.wrap_future(cfut)
+    except exceptions.CancelledError:
+        # wrap_future() has already dropped the job if it was still queued;
+        # a running thread cannot be interrupted, give it grace seconds to
+        # finish before abandoning it
+        if grace > 0 and not cfut.done():
+            await tasks.wait([futures.wrap_future(cfut)], timeout=grace)
+        raise
@@ -0,0 +1,237 @@
+"""
+a pool of Runners, one event loop per thread
+"""
+
+from __future__ import annotations
+
+__all__ = ["RunnerPool", "RoundRobin", "KeyAffinity", "least_loaded"]
+
+import asyncio
+import concurrent.futures
+import itertools
+import os
+import threading
+from asyncio import AbstractEventLoop
+from collections.abc import Callable, Coroutine, Hashable, Sequence
+from typing import Any, TypeVar, Union, final
+
+from typing_extensions import Self
+
+from .runners import Runner
+
+_T = TypeVar("_T")
+
+Policy = Callable[[Sequence[int], Union[Hashable, None]], int]
+
+
+class RoundRobin:
+    """Hand submissions to each loop in turn."""
+
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+
+    def __call__(self, loads: Sequence[int], key: Hashable | None) -> int:
+        return next(self._counter) % len(loads)
+
+
+def least_loaded(loads: Sequence[int], key: Hashable | None) -> int:
+    """Pick the loop with the fewest submissions in flight."""
+    return min(range(len(loads)), key=loads.__getitem__)
+
+
+class KeyAffinity:
+    """Send every submission with the same key to the same loop.
+
+    Submissions without a key go through fallback (round robin by default).
+    """
+
+    def __init__(self, fallback: Policy | None = None) -> None:
+        self._fallback = RoundRobin() if fallback is None else fallback
+
+    def __call__(self, loads: Sequence[int], key: Hashable | None) -> int:
+        if key is None:
+            return self._fallback(loads, key)
+        return hash(key) % len(loads)
+
+
+_POLICIES: dict[str, Callable[[], Policy]] = {
+    "round_robin": RoundRobin,
+    "least_loaded": lambda: least_loaded,
+    "key_affinity": KeyAffinity,
+}
+
+
+class _Worker:
+    def __init__(self, pool: RunnerPool, index: int) -> None:
+        self.pending: set[concurrent.futures.Future] = set()
+        self.loop: AbstractEventLoop | None = None
+        self._pool = pool
+        self._ready = threading.Event()
+        self._stop: asyncio.Event | None = None
+        self._error: BaseException | None = None
+        self._drain = True
+        self.thread = threading.Thread(
+            target=self._main, name=f"taskgroup-runner-pool-{index}", daemon=True,
+        )
+
+    def start(self) -> None:
+        self.thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def stop(self, *, drain: bool) -> None:
+        if self.loop is not None and self._stop is not None:
+            self._drain = drain
+            self.loop.call_soon_threadsafe(self._stop.set)
+        self.thread.join()
+
+    def _main(self) -> None:
+        try:
+            with Runner(debug=self._pool._debug, loop_factory=self._pool._loop_factory) as runner:
+                runner.run(self._serve())
+        except BaseException as exc:
+            if not self._ready.is_set():
+                self._error = exc
+                self._ready.set()
+            else:
+                raise
+
+    async def _serve(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._ready.set()
+        await self._stop.wait()
+        if self._drain:
+            current = asyncio.current_task()
+            others = [t for t in asyncio.all_tasks() if t is not current]
+            if others:
+                await asyncio.wait(others)
+        # whatever is still running is cancelled by Runner.close()
+
+
+@final
+class RunnerPool:
+    """Run coroutines on a pool of event loops, one Runner per thread.
+
+    submit() picks a loop with the pool's policy and returns a
+    concurrent.futures.Future; await run() from async code instead.
+    policy is one of "round_robin", "least_loaded" or "key_affinity", or a
+    callable taking the per-loop in-flight counts and the submission's key
+    and returning the index of the loop to use.
+
+    Each loop is created and finalized by its own Runner (with loop_factory
+    and debug passed through), so it is set up and shut down like the loop
+    of taskgroup.run(). close() waits for submitted work to finish unless
+    cancel_pending is True.
+
+    The loops share one process, so they only scale across cores as far as
+    the GIL allows: mostly when the work releases it (I/O, C extensions).
+    """
+
+    def __init__(
+        self,
+        size: int | None = None,
+        *,
+        policy: str | Policy = "round_robin",
+        debug: bool | None = None,
+        loop_factory: Callable[[], AbstractEventLoop] | None = None,
+    ) -> None:
+        if size is None:
+            size = os.cpu_count() or 1
+        if size < 1:
+            raise ValueError(f"size must be >= 1, got {size!r}")
+        if isinstance(policy, str):
+            try:
+                policy = _POLICIES[policy]()
+            except KeyError:
+                raise ValueError(f"unknown policy {policy!r}") from None
+        self._size = size
+        self._policy = policy
+        self._debug = debug
+        self._loop_factory = loop_factory
+        # replaced by the full list once every worker is ready, submit()
+        # may read it from any thread
+        self._workers: list[_Worker] = []
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+
+    def __repr__(self) -> str:
+        state = "closed" if self._closed else "started" if self._started else "created"
+        return f"<RunnerPool {state} size={self._size} loads={self.loads()}>"
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def start(self) -> None:
+        """Start every loop; called by submit() if needed."""
+        if self._started:
+            return
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("RunnerPool is closed")
+            if self._started:
+                return
+            workers: list[_Worker] = []
+            try:
+                for index in range(self._size):
+                    worker = _Worker(self, index)
+                    workers.append(worker)
+                    worker.start()
+            except BaseException:
+                self._closed = True
+                for worker in workers:
+                    worker.stop(drain=False)
+                raise
+            self._workers = workers
+            self._started = True
+
+    def close(self, *, cancel_pending: bool = False) -> None:
+        """Stop every loop and close its Runner."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = self._workers
+        for worker in workers:
+            worker.stop(drain=not cancel_pending)
+
+    def loads(self) -> list[int]:
+        """Number of submissions in flight on each loop."""
+        return [len(worker.pending) for worker in self._workers]
+
+    def loops(self) -> list[AbstractEventLoop]:
+        return [worker.loop for worker in self._workers if worker.loop is not None]
+
+    def submit(self, coro: Coroutine[Any, Any, _T], *, key: Hashable | None = None) -> concurrent.futures.Future[_T]:
+        """Schedule coro on one of the pool's loops.
+
+        key is passed to the policy, e.g. to keep related work on one loop.
+        """
+        if not asyncio.iscoroutine(coro):
+            raise TypeError(f"a coroutine was expected, got {coro!r}")
+        try:
+            if self._closed:
+                raise RuntimeError("RunnerPool is closed")
+            self.start()
+            worker = self._workers[self._policy(self.loads(), key)]
+            assert worker.loop is not None
+            fut = asyncio.run_coroutine_threadsafe(coro, worker.loop)
+        except BaseException:
+            coro.close()
+            raise
+        worker.pending.add(fut)
+        fut.add_done_callback(worker.pending.discard)
+        return fut
+
+    async def run(self, coro: Coroutine[Any, Any, _T], *, key: Hashable | None = None) -> _T:
+        """Await coro running on one of the pool's loops.
+
+        Cancelling the caller cancels the submitted coroutine.
+        """
+        return await asyncio.wrap_future(self.submit(coro, key=key))
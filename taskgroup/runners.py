@@ -1,7 +1,7 @@
 # backported from cpython 3.12 bceb197947bbaebb11e01195bdce4f240fdf9332
 # Copyright © 2001-2022 Python Software Foundation; All Rights Reserved
 # modified to support working on 3.10, custom task_factory installed to
-# support uncancel and contexts
+# support uncancel and contexts there
 
 __all__ = ('Runner', 'run')
 
@@ -10,6 +10,7 @@ import contextvars
 import enum
 import functools
 import signal
+import sys
 import threading
 from asyncio import AbstractEventLoop, coroutines, events, exceptions, tasks
 from typing import Any, TypeVar, final
@@ -17,6 +18,8 @@ from typing import Any, TypeVar, final
 from typing_extensions import Self
 
 from .tasks import task_factory as _task_factory
+from .monitor import LoopMonitor
+from . import tree as _tree
 
 
 class _State(enum.Enum):
@@ -37,6 +40,22 @@ class Runner:
 
     If debug is True, the event loop will be run in debug mode.
     If loop_factory is passed, it is used for new event loop creation.
+    If monitor is passed, it watches event loop lag and slow steps while
+    run() is running; see taskgroup.monitor.LoopMonitor.
+
+    By default close() cancels every remaining task at once and waits for
+    all of them, like asyncio.Runner. Setting shutdown_grace or
+    shutdown_timeout switches to a graceful shutdown: remaining tasks get
+    shutdown_grace seconds to finish on their own, the rest are cancelled
+    in batches, and whatever has not finished shutdown_timeout seconds
+    after close() started is reported to the loop's exception handler and
+    left behind. If handle_sigterm is True, SIGTERM cancels the main task
+    like a first Ctrl-C does, and run() raises SystemExit.
+
+    If dump_signal is set, e.g. to signal.SIGUSR1, receiving that signal
+    while run() is running prints the tree of pending tasks, TaskGroups
+    and Timeouts to stderr; see taskgroup.tree.format_tree(). This turns
+    on taskgroup.tree.enable() for the whole process.
 
     asyncio.run(main(), debug=True)
 
@@ -60,11 +79,26 @@ class Runner:
         self,
         *,
         debug: bool | None = None,
-        loop_factory: collections.abc.Callable[[], AbstractEventLoop] | None = None
+        loop_factory: collections.abc.Callable[[], AbstractEventLoop] | None = None,
+        monitor: LoopMonitor | None = None,
+        shutdown_grace: float = 0.0,
+        shutdown_timeout: float | None = None,
+        handle_sigterm: bool = False,
+        dump_signal: int | None = None,
         ) -> None:
+        if shutdown_grace < 0:
+            raise ValueError(f"shutdown_grace must be >= 0, got {shutdown_grace!r}")
+        if shutdown_timeout is not None and shutdown_timeout < shutdown_grace:
+            raise ValueError("shutdown_timeout must not be shorter than shutdown_grace")
         self._state = _State.CREATED
         self._debug = debug
         self._loop_factory = loop_factory
+        self._monitor = monitor
+        self._shutdown_grace = shutdown_grace
+        self._shutdown_timeout = shutdown_timeout
+        self._handle_sigterm = handle_sigterm
+        self._dump_signal = dump_signal
+        self._terminated = False
         self._loop = None
         self._context = None
         self._interrupt_count = 0
@@ -85,9 +119,14 @@ class Runner:
         loop = self._loop
         assert loop is not None
         try:
-            _cancel_all_tasks(loop)
-            loop.run_until_complete(loop.shutdown_asyncgens())
-            loop.run_until_complete(loop.shutdown_default_executor())
+            if self._shutdown_grace or self._shutdown_timeout is not None:
+                loop.run_until_complete(_graceful_shutdown(
+                    loop, self._shutdown_grace, self._shutdown_timeout,
+                ))
+            else:
+                _cancel_all_tasks(loop)
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.run_until_complete(loop.shutdown_default_executor())
         finally:
             if self._set_event_loop:
                 events.set_event_loop(None)
@@ -114,9 +153,16 @@ class Runner:
         self._lazy_init()
         assert self._loop is not None
 
+        if self._dump_signal is not None:
+            # before the main task exists, which may start eagerly
+            _tree.enable()
+
         if context is None:
             context = self._context
-        task = _task_factory(self._loop, coro, context=context)
+        if sys.version_info >= (3, 11):
+            task = self._loop.create_task(coro, context=context)
+        else:
+            task = _task_factory(self._loop, coro, context=context)
 
         if (threading.current_thread() is threading.main_thread()
             and signal.getsignal(signal.SIGINT) is signal.default_int_handler
@@ -132,7 +178,33 @@ class Runner:
         else:
             sigint_handler = None
 
+        sigterm_handler = None
+        if (self._handle_sigterm
+            and threading.current_thread() is threading.main_thread()
+            and signal.getsignal(signal.SIGTERM) is signal.SIG_DFL
+        ):
+            sigterm_handler = functools.partial(self._on_sigterm, main_task=task)
+            try:
+                signal.signal(signal.SIGTERM, sigterm_handler)
+            except ValueError:
+                sigterm_handler = None
+
+        dump_signal = self._dump_signal
+        dump_handler = None
+        if (dump_signal is not None
+            and threading.current_thread() is threading.main_thread()
+            and signal.getsignal(dump_signal) is signal.SIG_DFL
+        ):
+            dump_handler = self._on_dump_signal
+            try:
+                signal.signal(dump_signal, dump_handler)
+            except ValueError:
+                dump_handler = None
+
         self._interrupt_count = 0
+        self._terminated = False
+        if self._monitor is not None:
+            self._monitor.start(self._loop)
         try:
             if self._set_event_loop:
                 events.set_event_loop(self._loop)
@@ -142,12 +214,27 @@ class Runner:
                 uncancel = getattr(task, "uncancel", None)
                 if uncancel is not None and uncancel() == 0:
                     raise KeyboardInterrupt()
+            if self._terminated:
+                uncancel = getattr(task, "uncancel", None)
+                if uncancel is not None and uncancel() == 0:
+                    raise SystemExit(128 + signal.SIGTERM)
             raise  # CancelledError
         finally:
+            if self._monitor is not None:
+                self._monitor.stop()
             if (sigint_handler is not None
                 and signal.getsignal(signal.SIGINT) is sigint_handler
             ):
                 signal.signal(signal.SIGINT, signal.default_int_handler)
+            if (sigterm_handler is not None
+                and signal.getsignal(signal.SIGTERM) is sigterm_handler
+            ):
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            if (dump_signal is not None
+                and dump_handler is not None
+                and signal.getsignal(dump_signal) is dump_handler
+            ):
+                signal.signal(dump_signal, signal.SIG_DFL)
 
     def _lazy_init(self) -> None:
         if self._state is _State.CLOSED:
@@ -165,7 +252,9 @@ class Runner:
             self._loop = self._loop_factory()
         if self._debug is not None:
             self._loop.set_debug(self._debug)
-        self._loop.set_task_factory(_task_factory)
+        if sys.version_info < (3, 11):
+            # asyncio.Task has no cancelling() or uncancel() before 3.11
+            self._loop.set_task_factory(_task_factory)
         self._context = contextvars.copy_context()
         self._state = _State.INITIALIZED
 
@@ -179,6 +268,19 @@ class Runner:
             return
         raise KeyboardInterrupt()
 
+    def _on_sigterm(self, signum, frame, main_task):
+        if not self._terminated and not main_task.done():
+            self._terminated = True
+            main_task.cancel()
+            assert self._loop is not None
+            self._loop.call_soon_threadsafe(lambda: None)
+
+    def _on_dump_signal(self, signum, frame):
+        # the handler may interrupt the loop anywhere, render the tree from
+        # a callback of its own instead
+        assert self._loop is not None
+        self._loop.call_soon_threadsafe(_tree.print_tree, self._loop)
+
 
 def run(main: collections.abc.Coroutine[Any, Any, _T], *, debug: bool | None = None) -> _T:
     """Execute the coroutine and return the result.
@@ -232,3 +334,99 @@ def _cancel_all_tasks(loop):
                 'exception': task.exception(),
                 'task': task,
             })
+
+
+# how many tasks a graceful shutdown cancels per event loop iteration
+_CANCEL_BATCH = 1024
+
+# seconds that shutting down async generators and the default executor get
+# even when stragglers used up the whole shutdown deadline
+_MIN_SHUTDOWN_STEP = 0.1
+
+
+async def _graceful_shutdown(loop, grace, timeout):
+    current = tasks.current_task(loop)
+    start = loop.time()
+    deadline = None if timeout is None else start + timeout
+
+    def remaining(until):
+        return None if until is None else max(0.0, until - loop.time())
+
+    def pending():
+        return [t for t in tasks.all_tasks(loop) if t is not current]
+
+    if grace:
+        drain_until = start + grace
+        # tasks may spawn more tasks while draining
+        while (to_wait := pending()) and loop.time() < drain_until:
+            await tasks.wait(to_wait, timeout=remaining(drain_until))
+
+    # one done callback per task both reports its exception and counts it
+    # down, rather than a gather() or wait() over all of them
+    cancelled = set()
+    outstanding = 0
+    all_done = None
+
+    def on_done(task):
+        nonlocal outstanding
+        outstanding -= 1
+        assert all_done is not None
+        if outstanding == 0 and not all_done.done():
+            all_done.set_result(None)
+        if not task.cancelled() and task.exception() is not None:
+            loop.call_exception_handler({
+                'message': 'unhandled exception during asyncio.run() shutdown',
+                'exception': task.exception(),
+                'task': task,
+            })
+
+    while (to_wait := pending()) and remaining(deadline) != 0:
+        all_done = loop.create_future()
+        count = 0
+        for task in to_wait:
+            if task in cancelled:
+                continue
+            cancelled.add(task)
+            outstanding += 1
+            task.add_done_callback(on_done)
+            task.cancel()
+            count += 1
+            if count % _CANCEL_BATCH == 0:
+                # let this batch unwind before cancelling the next one
+                await tasks.sleep(0)
+        if not outstanding:
+            # only tasks that are already done but not yet unregistered
+            await tasks.sleep(0)
+            continue
+        await tasks.wait([all_done], timeout=remaining(deadline))
+
+    for task in pending():
+        loop.call_exception_handler({
+            'message': f'Task did not finish within the {timeout}s shutdown deadline',
+            'task': task,
+        })
+
+    async def bounded(coro, what):
+        step = loop.create_task(coro)
+        timeout_ = remaining(deadline)
+        if timeout_ is not None:
+            timeout_ = max(timeout_, _MIN_SHUTDOWN_STEP)
+        done, _ = await tasks.wait([step], timeout=timeout_)
+        if done:
+            step.result()
+            return
+        step.cancel()
+        await tasks.wait([step])
+        loop.call_exception_handler({
+            'message': f'{what} did not shut down within the {timeout}s shutdown deadline',
+        })
+
+    await bounded(loop.shutdown_asyncgens(), 'Async generators')
+    if sys.version_info >= (3, 12):
+        executor_timeout = remaining(deadline)
+        if executor_timeout is not None:
+            executor_timeout = max(executor_timeout, _MIN_SHUTDOWN_STEP)
+        await bounded(loop.shutdown_default_executor(executor_timeout), 'The default executor')
+    else:
+        await bounded(loop.shutdown_default_executor(), 'The default executor')
+
@@ -0,0 +1,124 @@
+"""
+priority scheduling of ready task steps, installed with a Runner loop_factory
+"""
+
+from __future__ import annotations
+
+__all__ = ["PriorityReadyQueue", "priority_loop_factory"]
+
+import collections
+from asyncio import AbstractEventLoop, events
+from collections.abc import Callable
+
+
+class PriorityReadyQueue:
+    """Replacement for an asyncio event loop's FIFO queue of ready handles.
+
+    Each handle is queued by the priority of the task it steps or wakes
+    up: the _priority of taskgroup.tasks.PriorityTask, 0 for everything
+    else. Higher priorities are run first and handles of equal priority in
+    the order they were scheduled, so with a single priority this behaves
+    exactly like the loop's deque.
+
+    A handle that has waited while max_wait other handles ran goes next
+    whatever its priority, so a flood of high priority work delays lower
+    priorities but cannot starve them.
+
+    The loop still runs only the handles that were ready when its current
+    iteration started, so I/O is polled as often as usual.
+
+    call_soon_threadsafe() appends from other threads, so append() only
+    pushes onto a plain deque, which is atomic; popleft(), always on the
+    loop's thread, sorts what arrived into the priority queues.
+    """
+
+    __slots__ = ("_inbox", "_queues", "_len", "_pops", "_max_wait")
+
+    def __init__(self, max_wait: int = 100) -> None:
+        if max_wait < 1:
+            raise ValueError(f"max_wait must be >= 1, got {max_wait!r}")
+        self._inbox: collections.deque[events.Handle] = collections.deque()
+        # priority -> FIFO of (pop count when queued, handle); only
+        # priorities with queued handles have an entry. Only touched on
+        # the loop's thread, like _len and _pops
+        self._queues: dict[int, collections.deque[tuple[int, events.Handle]]] = {}
+        self._len = 0
+        self._pops = 0
+        self._max_wait = max_wait
+
+    def __repr__(self) -> str:
+        sizes = {prio: len(q) for prio, q in sorted(self._queues.items(), reverse=True)}
+        return f"<PriorityReadyQueue {sizes} inbox={len(self._inbox)}>"
+
+    def __len__(self) -> int:
+        return self._len + len(self._inbox)
+
+    def append(self, handle: events.Handle) -> None:
+        self._inbox.append(handle)
+
+    def _sort_inbox(self) -> None:
+        inbox = self._inbox
+        queues = self._queues
+        pops = self._pops
+        # only ever popped here, so the length can only grow meanwhile
+        for _ in range(len(inbox)):
+            handle = inbox.popleft()
+            task = getattr(handle._callback, "__self__", None)
+            priority = getattr(task, "_priority", 0)
+            queue = queues.get(priority)
+            if queue is None:
+                queue = queues[priority] = collections.deque()
+            queue.append((pops, handle))
+            self._len += 1
+
+    def popleft(self) -> events.Handle:
+        if self._inbox:
+            self._sort_inbox()
+        queues = self._queues
+        if not queues:
+            raise IndexError("pop from an empty PriorityReadyQueue")
+        if len(queues) == 1:
+            priority = next(iter(queues))
+        else:
+            priority = max(queues)
+            oldest = min(queues, key=lambda p: queues[p][0][0])
+            if self._pops - queues[oldest][0][0] >= self._max_wait:
+                priority = oldest
+        queue = queues[priority]
+        _, handle = queue.popleft()
+        if not queue:
+            del queues[priority]
+        self._len -= 1
+        self._pops += 1
+        return handle
+
+    def clear(self) -> None:
+        self._inbox.clear()
+        self._queues.clear()
+        self._len = 0
+
+
+def priority_loop_factory(
+    max_wait: int = 100,
+    *,
+    loop_factory: Callable[[], AbstractEventLoop] = events.new_event_loop,
+) -> Callable[[], AbstractEventLoop]:
+    """A loop_factory for Runner whose loops run higher priority tasks first.
+
+        with taskgroup.Runner(loop_factory=priority_loop_factory()) as runner:
+            runner.run(main())
+
+    Task priorities are set with TaskGroup.create_task(priority=...).
+    loop_factory creates the underlying loops; they must be asyncio's own
+    pure python event loops (asyncio.BaseEventLoop), whose ready queue
+    this replaces with a PriorityReadyQueue.
+    """
+    def factory() -> AbstractEventLoop:
+        loop = loop_factory()
+        if not isinstance(getattr(loop, "_ready", None), collections.deque):
+            loop.close()
+            raise TypeError(f"cannot install priority scheduling on {loop!r}")
+        loop._ready = PriorityReadyQueue(max_wait)  # type: ignore[attr-defined]
+        return loop
+
+    return factory
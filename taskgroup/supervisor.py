@@ -0,0 +1,177 @@
+"""
+a TaskGroup that restarts failed children instead of aborting
+"""
+
+from __future__ import annotations
+
+__all__ = ["Supervisor", "SupervisedChild"]
+
+import collections
+from asyncio import tasks
+from collections.abc import Callable, Coroutine
+from typing import Any, Literal
+
+from .taskgroups import TaskGroup
+
+
+class SupervisedChild:
+    """A child started with Supervisor.start_child().
+
+    task is the task currently running it; restarts counts how many times
+    it has been restarted.
+    """
+
+    __slots__ = ("fn", "args", "name", "restart", "task", "restarts", "_failures", "_started")
+
+    def __init__(self, fn: Callable[..., Coroutine[Any, Any, Any]], args: tuple[Any, ...], name: str | None, restart: str) -> None:
+        self.fn = fn
+        self.args = args
+        self.name = name
+        self.restart = restart
+        self.task: tasks.Task[Any] | None = None
+        self.restarts = 0
+        self._failures = 0
+        self._started = 0.0
+
+    def __repr__(self) -> str:
+        name = self.name or getattr(self.fn, "__qualname__", repr(self.fn))
+        return f"<SupervisedChild {name} restart={self.restart} restarts={self.restarts}>"
+
+
+class Supervisor(TaskGroup):
+    """A TaskGroup that restarts children started with start_child().
+
+    A supervised child that fails is started again on its own, one for
+    one, instead of aborting its siblings: after backoff seconds the first
+    time, doubling with each consecutive restart up to max_backoff. A
+    child that ran for at least period seconds before failing starts over
+    at backoff. With restart="permanent" a child is also restarted when it
+    returns, so the supervisor runs until it is cancelled.
+
+    If there are more than max_restarts restarts within period seconds the
+    failure escalates: the supervisor aborts exactly like a TaskGroup, and
+    raises the escalating error in its exception group from __aexit__; a
+    RuntimeError if it was a permanent child returning.
+    The error of every child that is restarted is reported to the loop's
+    exception handler instead.
+    Children created with create_task() or start_soon() are not supervised
+    and abort the group as usual, as do KeyboardInterrupt and SystemExit.
+
+    restarts counts all restarts so far, and each SupervisedChild counts
+    its own.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_restarts: int = 5,
+        period: float = 10.0,
+        backoff: float = 0.1,
+        max_backoff: float = 10.0,
+        **kwargs: Any,
+    ) -> None:
+        if max_restarts < 0:
+            raise ValueError(f"max_restarts must be >= 0, got {max_restarts!r}")
+        if period <= 0:
+            raise ValueError(f"period must be > 0, got {period!r}")
+        super().__init__(**kwargs)
+        self._max_restarts = max_restarts
+        self._period = period
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._children: dict[tasks.Task[Any], SupervisedChild] = {}
+        self._restart_times: collections.deque[float] = collections.deque()
+        self._restarted = None
+        self.restarts = 0
+
+    def __repr__(self) -> str:
+        return super().__repr__().replace('<TaskGroup', f'<Supervisor restarts={self.restarts}', 1)
+
+    def start_child(
+        self,
+        fn: Callable[..., Coroutine[Any, Any, Any]],
+        /,
+        *args: Any,
+        name: str | None = None,
+        restart: Literal["transient", "permanent"] = "transient",
+    ) -> SupervisedChild:
+        """Run fn(*args) as a supervised child, restarting it as needed.
+
+        fn is called again for every restart. A "transient" child is only
+        restarted when it fails, a "permanent" one also when it returns.
+        """
+        if restart not in ("transient", "permanent"):
+            raise ValueError(f"restart must be 'transient' or 'permanent', got {restart!r}")
+        child = SupervisedChild(fn, args, name, restart)
+        self._start(child, 0.0)
+        return child
+
+    def _start(self, child: SupervisedChild, delay: float) -> None:
+        task = self.create_task(self._run_child(child, delay), name=child.name)
+        child.task = task
+        self._children[task] = child
+
+    async def _run_child(self, child: SupervisedChild, delay: float) -> Any:
+        if delay:
+            await tasks.sleep(delay)
+        assert self._loop is not None
+        child._started = self._loop.time()
+        return await child.fn(*child.args)
+
+    def _should_restart(self, child: SupervisedChild, task: tasks.Task[Any]) -> bool:
+        if task.cancelled() or self._aborting:
+            return False
+        exc = task.exception()
+        if exc is None:
+            if child.restart != "permanent":
+                return False
+        elif self._is_base_error(exc):
+            return False
+
+        assert self._loop is not None
+        now = self._loop.time()
+        times = self._restart_times
+        times.append(now)
+        while times[0] <= now - self._period:
+            times.popleft()
+        if len(times) > self._max_restarts:
+            # escalate
+            if exc is None:
+                # a permanent child that returned has no error of its own
+                # to abort the group with
+                self._child_failed(task, RuntimeError(
+                    f'Supervised child {child!r} returned, restarting it would exceed '
+                    f'max_restarts={self._max_restarts} within {self._period}s'))
+            return False
+
+        if now - child._started >= self._period:
+            child._failures = 0
+        delay = min(self._max_backoff, self._backoff * (2 ** min(child._failures, 32)))
+        child._failures += 1
+        child.restarts += 1
+        self.restarts += 1
+        if exc is not None:
+            # the error is not raised from __aexit__, report it
+            self._loop.call_exception_handler({
+                'message': f'Supervised child {child!r} failed, restarting it in {delay:.3f}s',
+                'exception': exc,
+                'task': task,
+            })
+        # the old task is still in self._tasks, so this cannot find the
+        # group finished even if it was its last child
+        self._start(child, delay)
+        return True
+
+    def _on_task_done(self, task):
+        child = self._children.pop(task, None)
+        if child is not None and self._should_restart(child, task):
+            self._restarted = task
+        try:
+            super()._on_task_done(task)
+        finally:
+            self._restarted = None
+
+    def _child_failed(self, task, exc):
+        if task is self._restarted:
+            return
+        super()._child_failed(task, exc)
@@ -3,7 +3,7 @@
 # modified to support working on 3.10
 
 from __future__ import annotations
-from contextvars import Context
+from contextvars import Context, copy_context
 
 __all__ = ["TaskGroup"]
 
@@ -11,22 +11,108 @@ import sys
 from asyncio import events
 from asyncio import exceptions
 from asyncio import tasks
-from collections.abc import AsyncGenerator, Coroutine
-from typing import Any, TypeVar
+import collections
+import concurrent.futures
+from collections.abc import AsyncGenerator, Callable, Coroutine, Iterable
+from typing import Any, Literal, TypeVar
 
 from exceptiongroup import BaseExceptionGroup
-import contextlib
-from .tasks import task_factory as _task_factory, Task
-from . import install as _install
+from .tasks import task_factory as _task_factory, eager_task_factory as _eager_task_factory
+from .tasks import MeteredTask as _MeteredTask, PriorityTask as _PriorityTask, TaskStats as _TaskStats
+from . import instruments as _instruments
+from . import errors as _errors
+from . import offload as _offload
+from . import multiplex as _multiplex
+from . import tree as _tree
+
+if sys.version_info < (3, 11):
+    from . import install as _install
 
 from typing_extensions import Self
 
 _T = TypeVar("_T")
+_A = TypeVar("_A")
 
+# how many children _abort() cancels per event loop iteration
+_ABORT_BATCH = 1000
 
-class TaskGroup:
 
-    def __init__(self) -> None:
+class TaskGroup:
+    """Asynchronous context manager for managing a group of tasks.
+
+    If eager_start is True, children are created with eager_task_factory:
+    each coroutine runs synchronously in create_task() until it first
+    suspends, and children that finish without suspending never go
+    through the event loop.
+
+    If max_concurrency is set, spawn() suspends the caller until fewer
+    than max_concurrency children are running, so a producer can feed a
+    very large input through the group without holding every pending
+    task at once. create_task() is not bounded.
+
+    instruments are notified of the group's lifecycle events in addition
+    to the ones registered with taskgroup.instruments.add_instrument().
+
+    thread_grace is how long, in seconds, a run_in_thread() child that is
+    cancelled while its thread is running waits for the thread before
+    giving up on it; __aexit__ never waits on an abandoned thread.
+
+    error_policy bounds how many child errors the group keeps for the
+    exception group it raises, see taskgroup.errors; by default all are.
+
+    context_policy decides the context children run in when create_task()
+    or start_soon() is not given one. "copy", the default, gives each
+    child its own copy of the current context, as asyncio does. "shared"
+    runs all of them in a single copy of the parent's context taken when
+    the group is entered, saving one Context per child: use it for
+    children that do not set context variables, as siblings would see
+    each other's changes. On 3.10, where asyncio.Task cannot be given a
+    context without wrapping every step of the coroutine, "shared" falls
+    back to "copy".
+
+    create_task(priority=...) gives a child a scheduling priority, honoured
+    by loops made with taskgroup.scheduler.priority_loop_factory(): steps
+    of higher priority children run first, 0 is the default priority, and
+    background work can use negative ones.
+
+    With accounting=True every child's steps are timed, see
+    taskgroup.tasks.TaskStats: children are created as MeteredTask, each
+    with its numbers on its stats, and the group's stats add up those of
+    its finished children. This costs two clock reads per step, and
+    cannot be combined with eager_start.
+    """
+
+    def __init__(
+        self,
+        *,
+        eager_start: bool = False,
+        max_concurrency: int | None = None,
+        instruments: Iterable[_instruments.Instrument] = (),
+        thread_grace: float = 0.0,
+        error_policy: _errors.ErrorPolicy | None = None,
+        context_policy: Literal["copy", "shared"] = "copy",
+        accounting: bool = False,
+    ) -> None:
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency!r}")
+        if thread_grace < 0:
+            raise ValueError(f"thread_grace must be >= 0, got {thread_grace!r}")
+        if context_policy not in ("copy", "shared"):
+            raise ValueError(f"context_policy must be 'copy' or 'shared', got {context_policy!r}")
+        if context_policy == "shared" and eager_start:
+            # an eager child would enter the shared context while the
+            # sibling creating it is already running in it
+            raise ValueError("context_policy='shared' cannot be combined with eager_start")
+        if accounting and eager_start:
+            # eager children are not taskgroup.tasks.Task on 3.11
+            raise ValueError("accounting cannot be combined with eager_start")
+        self._eager_start = eager_start
+        self._max_concurrency = max_concurrency
+        self._spawn_waiters = collections.deque()
+        self._instruments = (*_instruments._instruments, *instruments)
+        self._thread_grace = thread_grace
+        self._share_context = context_policy == "shared" and sys.version_info >= (3, 11)
+        self._shared_context = None
         self._entered = False
         self._exiting = False
         self._aborting = False
@@ -34,10 +120,21 @@ class TaskGroup:
         self._parent_task = None
         self._parent_cancel_requested = False
         self._tasks = set()
-        self._errors = []
+        self._error_policy = error_policy
+        self._errors: list[BaseException] | _errors.ErrorCollector | None = (
+            [] if error_policy is None else error_policy.collector()
+        )
         self._base_error = None
         self._on_completed_fut = None
-        self._cmgr = self._cmgr_factory()
+        self._completed = None
+        self._completed_waiter = None
+        self._multiplexer = None
+        self._stats = _TaskStats() if accounting else None
+
+    @property
+    def stats(self) -> _TaskStats | None:
+        """The rolled up TaskStats of finished children, None unless accounting."""
+        return self._stats
 
     def __repr__(self) -> str:
         info = ['']
@@ -45,6 +142,8 @@ class TaskGroup:
             info.append(f'tasks={len(self._tasks)}')
         if self._errors:
             info.append(f'errors={len(self._errors)}')
+        if self._spawn_waiters:
+            info.append(f'waiting={len(self._spawn_waiters)}')
         if self._aborting:
             info.append('cancelling')
         elif self._entered:
@@ -53,8 +152,7 @@ class TaskGroup:
         info_str = ' '.join(info)
         return f'<TaskGroup{info_str}>'
 
-    @contextlib.asynccontextmanager
-    async def _cmgr_factory(self) -> AsyncGenerator[Self, None]:
+    async def __aenter__(self) -> Self:
         if self._entered:
             raise RuntimeError(
                 f"TaskGroup {self!r} has been already entered")
@@ -63,102 +161,125 @@ class TaskGroup:
         if self._loop is None:
             self._loop = events.get_running_loop()
 
-        async with _install.install_uncancel():
-            self._parent_task = tasks.current_task(self._loop)
-            if self._parent_task is None:
-                raise RuntimeError(
-                    f'TaskGroup {self!r} cannot determine the parent task')
-
-            try:
-                yield self
-            finally:
-                et, exc, _ = sys.exc_info()
-                self._exiting = True
-                propagate_cancellation_error = exc if et is exceptions.CancelledError else None
-
-            if self._parent_cancel_requested:
-                # If this flag is set we *must* call uncancel().
-                if self._parent_task.uncancel() == 0:
-                    # If there are no pending cancellations left,
-                    # don't propagate CancelledError.
-                    propagate_cancellation_error = None
-
-                if et is not None:
-                    if not self._aborting:
-                        # Our parent task is being cancelled:
-                        #
-                        #    async with TaskGroup() as g:
-                        #        g.create_task(...)
-                        #        await ...  # <- CancelledError
-                        #
-                        # or there's an exception in "async with":
-                        #
-                        #    async with TaskGroup() as g:
-                        #        g.create_task(...)
-                        #        1 / 0
-                        #
-                        self._abort()
-
-                # We use while-loop here because "self._on_completed_fut"
-                # can be cancelled multiple times if our parent task
-                # is being cancelled repeatedly (or even once, when
-                # our own cancellation is already in progress)
-                while self._tasks:
-                    if self._on_completed_fut is None:
-                        self._on_completed_fut = self._loop.create_future()
-
-                    try:
-                        await self._on_completed_fut
-                    except exceptions.CancelledError as ex:
-                        if not self._aborting:
-                            # Our parent task is being cancelled:
-                            #
-                            #    async def wrapper():
-                            #        async with TaskGroup() as g:
-                            #            g.create_task(foo)
-                            #
-                            # "wrapper" is being cancelled while "foo" is
-                            # still running.
-                            propagate_cancellation_error = ex
-                            self._abort()
-
-                    self._on_completed_fut = None
-
-                assert not self._tasks
-
-                if self._base_error is not None:
-                    raise self._base_error
-
-                # Propagate CancelledError if there is one, except if there
-                # are other errors -- those have priority.
-                if propagate_cancellation_error and not self._errors:
-                    # The wrapping task was cancelled; since we're done with
-                    # closing all child tasks, just propagate the cancellation
-                    # request now.
-                    raise propagate_cancellation_error
-
-                if et is not None and et is not exceptions.CancelledError:
-                    assert self._errors is not None
-                    self._errors.append(exc)
-
-                if self._errors:
-                    # Exceptions are heavy objects that can have object
-                    # cycles (bad for GC); let's not keep a reference to
-                    # a bunch of them.
-                    errors = self._errors
-                    self._errors = None
-
-                    me = BaseExceptionGroup('unhandled errors in a TaskGroup', errors)
-                    raise me from None
+        self._parent_task = tasks.current_task(self._loop)
+        if self._parent_task is None:
+            raise RuntimeError(
+                f'TaskGroup {self!r} cannot determine the parent task')
 
-    async def __aenter__(self) -> Self:
-        return await self._cmgr.__aenter__()
+        if self._share_context:
+            self._shared_context = copy_context()
 
-    async def __aexit__(self, *exc_info) -> bool | None:
-        return await self._cmgr.__aexit__(*exc_info)  # type: ignore
+        if _tree._enabled:
+            _tree._groups.add(self)
+        return self
 
+    async def __aexit__(self, et, exc, tb) -> bool | None:
+        assert self._loop is not None
+        assert self._parent_task is not None
+        self._exiting = True
+        propagate_cancellation_error = exc if et is exceptions.CancelledError else None
+
+        if self._parent_cancel_requested:
+            # If this flag is set we *must* call uncancel().
+            if self._parent_task.uncancel() == 0:
+                # If there are no pending cancellations left,
+                # don't propagate CancelledError.
+                propagate_cancellation_error = None
+
+        if et is not None:
+            if not self._aborting:
+                # Our parent task is being cancelled:
+                #
+                #    async with TaskGroup() as g:
+                #        g.create_task(...)
+                #        await ...  # <- CancelledError
+                #
+                # or there's an exception in "async with":
+                #
+                #    async with TaskGroup() as g:
+                #        g.create_task(...)
+                #        1 / 0
+                #
+                self._abort()
+
+        # We use while-loop here because "self._on_completed_fut"
+        # can be cancelled multiple times if our parent task
+        # is being cancelled repeatedly (or even once, when
+        # our own cancellation is already in progress)
+        while self._tasks:
+            if self._instruments:
+                self._notify("group_draining", len(self._tasks))
+            if self._on_completed_fut is None:
+                self._on_completed_fut = self._loop.create_future()
 
-    def create_task(self, coro: Coroutine[Any, Any, _T], *, name: str | None = None, context: Context | None = None) -> Task[_T]:
+            try:
+                await self._on_completed_fut
+            except exceptions.CancelledError as ex:
+                if not self._aborting:
+                    # Our parent task is being cancelled:
+                    #
+                    #    async def wrapper():
+                    #        async with TaskGroup() as g:
+                    #            g.create_task(foo)
+                    #
+                    # "wrapper" is being cancelled while "foo" is
+                    # still running.
+                    propagate_cancellation_error = ex
+                    self._abort()
+
+            self._on_completed_fut = None
+
+        if _tree._enabled:
+            _tree._groups.discard(self)
+        assert not self._tasks
+
+        if self._base_error is not None:
+            raise self._base_error
+
+        # Propagate CancelledError if there is one, except if there
+        # are other errors -- those have priority.
+        if propagate_cancellation_error and not self._errors:
+            # The wrapping task was cancelled; since we're done with
+            # closing all child tasks, just propagate the cancellation
+            # request now.
+            raise propagate_cancellation_error
+
+        body_error = exc if et is not None and et is not exceptions.CancelledError else None
+
+        if self._errors or body_error is not None:
+            # Exceptions are heavy objects that can have object
+            # cycles (bad for GC); let's not keep a reference to
+            # a bunch of them.
+            errors = self._errors
+            self._errors = None
+
+            if isinstance(errors, _errors.ErrorCollector):
+                # the policy only decides about the children's errors, the
+                # block's own is always raised
+                if not errors:
+                    assert body_error is not None
+                    me = BaseExceptionGroup('unhandled errors in a TaskGroup', [body_error])
+                else:
+                    me = errors.exception_group()
+                    if body_error is not None:
+                        me = me.derive([*me.exceptions, body_error])
+            else:
+                assert errors is not None
+                if body_error is not None:
+                    errors.append(body_error)
+                me = BaseExceptionGroup('unhandled errors in a TaskGroup', errors)
+            raise me from None
+
+        return None
+
+    def create_task(
+        self,
+        coro: Coroutine[Any, Any, _T],
+        *,
+        name: str | None = None,
+        context: Context | None = None,
+        priority: int | None = None,
+    ) -> tasks.Task[_T]:
         if not self._entered:
             raise RuntimeError(f"TaskGroup {self!r} has not been entered")
         if self._exiting and not self._tasks:
@@ -167,10 +288,21 @@ class TaskGroup:
             raise RuntimeError(f"TaskGroup {self!r} is shutting down")
         assert self._loop is not None
         if context is None:
-            task = _task_factory(self._loop, coro)
+            context = self._shared_context
+        stats = None if self._stats is None else _TaskStats()
+        if priority is not None:
+            # never eager: that would run it ahead of everything else
+            task = _PriorityTask(coro, loop=self._loop, name=name, context=context, priority=priority, stats=stats)
+        elif stats is not None:
+            task = _MeteredTask(coro, loop=self._loop, name=name, context=context, stats=stats)
+        elif self._eager_start:
+            task = _eager_task_factory(self._loop, coro, name=name, context=context)
+        elif sys.version_info >= (3, 11):
+            task = self._loop.create_task(coro, name=name, context=context)
         else:
-            task = _task_factory(self._loop, coro, context=context)
-        tasks._set_task_name(task, name)  # type: ignore
+            task = _task_factory(self._loop, coro, name=name, context=context)
+        if self._instruments:
+            self._notify("task_spawned", task)
         # optimization: Immediately call the done callback if the task is
         # already done (e.g. if the coro was able to complete eagerly),
         # and skip scheduling a done callback
@@ -181,6 +313,235 @@ class TaskGroup:
             task.add_done_callback(self._on_task_done)
         return task
 
+    def start_soon(self, coro: Coroutine[Any, Any, Any], *, context: Context | None = None) -> None:
+        """Run coro as a lightweight, fire-and-forget child of the group.
+
+        Lightweight children get no Task of their own: they are all stepped
+        by one driver task, which makes them much cheaper than create_task()
+        when there are very many of them. The group waits for the driver as
+        for a child, but as_completed(), instruments and accounting do not
+        see it.
+        Their results are discarded. An exception aborts the group and is
+        raised from __aexit__ like a failed task's, and aborting the group
+        cancels them.
+
+        As their code runs inside the driver task, asyncio.current_task()
+        is the driver: they must not use timeout(), nested TaskGroups or
+        anything else that cancels the current task, which would cancel
+        every lightweight child of the group. Instruments are not notified
+        of lightweight children.
+        """
+        if not self._entered:
+            coro.close()
+            raise RuntimeError(f"TaskGroup {self!r} has not been entered")
+        if self._exiting and not self._tasks:
+            coro.close()
+            raise RuntimeError(f"TaskGroup {self!r} is finished")
+        if self._aborting:
+            coro.close()
+            raise RuntimeError(f"TaskGroup {self!r} is shutting down")
+        assert self._loop is not None
+        multiplexer = self._multiplexer
+        if multiplexer is None:
+            multiplexer = self._multiplexer = _multiplex.Multiplexer(self, self._loop)
+            # never eager: it would find no children yet and finish at
+            # once. The driver enters each child's context in turn, so it
+            # must not run in the shared one itself
+            driver = _task_factory(
+                self._loop, multiplexer.drive(), context=Context() if self._share_context else None,
+            )
+            multiplexer.task = driver
+            self._tasks.add(driver)
+            driver.add_done_callback(self._on_driver_done)
+            driver.add_done_callback(multiplexer.on_driver_done)
+        if context is None:
+            context = copy_context() if self._shared_context is None else self._shared_context
+        multiplexer.start_soon(coro, context)
+
+    def run_in_thread(
+        self,
+        fn: Callable[..., _T],
+        /,
+        *args: Any,
+        name: str | None = None,
+        pool: _offload.ThreadPool | None = None,
+    ) -> tasks.Task[_T]:
+        """Run fn(*args) in a thread as a child task of the group.
+
+        Like asyncio.to_thread() the call sees a copy of the current
+        context. The job waits in a bounded pool, by default the shared
+        taskgroup.offload.get_thread_pool(); if the child is cancelled, e.g.
+        because the group aborts, before a thread picked it up it never
+        runs.
+        """
+        return self.create_task(
+            _offload.run_in_thread(pool, fn, args, self._thread_grace), name=name,
+        )
+
+    def create_process_task(
+        self,
+        fn: Callable[..., _T],
+        /,
+        *args: Any,
+        name: str | None = None,
+        executor: concurrent.futures.Executor | None = None,
+    ) -> tasks.Task[_T]:
+        """Run fn(*args) in a worker process as a child task of the group.
+
+        The child fails, and aborts the group, if fn raises. When the child
+        is cancelled a job that has not started yet is dropped; one that is
+        already running cannot be interrupted and is abandoned, its result
+        discarded. Large bytes, bytearray and memoryview results come back
+        through shared memory rather than the executor's pipe; a memoryview
+        result comes back as a flat view of a copy of its bytes.
+
+        executor defaults to a process pool shared by all groups, see
+        taskgroup.offload.get_process_pool(); fn and args must be picklable.
+        """
+        return self.create_task(_offload.run_in_process(executor, fn, args), name=name)
+
+    async def spawn(
+        self,
+        coro: Coroutine[Any, Any, _T],
+        *,
+        name: str | None = None,
+        context: Context | None = None,
+        priority: int | None = None,
+    ) -> tasks.Task[_T]:
+        """Create a child task once the group has a free slot.
+
+        Waits until fewer than max_concurrency children are running, then
+        behaves like create_task(). If the caller is cancelled or the group
+        starts shutting down while waiting, coro is closed without running.
+        """
+        try:
+            if self._max_concurrency is not None and (
+                self._spawn_waiters or len(self._tasks) >= self._max_concurrency
+            ):
+                await self._wait_for_slot()
+            return self.create_task(coro, name=name, context=context, priority=priority)
+        except BaseException:
+            coro.close()
+            raise
+
+    async def _wait_for_slot(self) -> None:
+        if self._aborting:
+            raise RuntimeError(f"TaskGroup {self!r} is shutting down")
+        assert self._loop is not None
+        fut = self._loop.create_future()
+        self._spawn_waiters.append(fut)
+        try:
+            await fut
+        except BaseException:
+            self._spawn_waiters.remove(fut)
+            if fut.done() and not fut.cancelled():
+                # we were handed a slot but cannot use it, pass it on
+                self._wake_spawn_waiters()
+            raise
+        self._spawn_waiters.remove(fut)
+
+    def _wake_spawn_waiters(self) -> None:
+        assert self._max_concurrency is not None
+        free = self._max_concurrency - len(self._tasks)
+        for fut in self._spawn_waiters:
+            if free <= 0:
+                break
+            # a done waiter has already been handed a slot it has not
+            # taken yet
+            if not fut.done():
+                fut.set_result(None)
+            free -= 1
+
+    async def map(self, async_fn: Callable[[_A], Coroutine[Any, Any, _T]], iterable: Iterable[_A], *, window: int) -> AsyncGenerator[_T, None]:
+        """Run async_fn over iterable in child tasks, yielding results in order.
+
+        At most window children are in flight at once and iterable is only
+        advanced as results are consumed, so it may be an unbounded
+        generator. Children are created with spawn(), so the group's
+        max_concurrency also applies.
+
+        A failing child aborts the group as usual and its error is raised
+        from __aexit__; the iterator itself stops with the cancellation
+        that abort delivers. Children still in flight when the iterator is
+        closed early are cancelled, so prefer contextlib.aclosing() when
+        breaking out of the loop.
+        """
+        if window < 1:
+            raise ValueError(f"window must be >= 1, got {window!r}")
+        pending = collections.deque()
+        try:
+            for arg in iterable:
+                pending.append(await self.spawn(async_fn(arg)))
+                if len(pending) >= window:
+                    yield await self._map_result(pending.popleft())
+            while pending:
+                yield await self._map_result(pending.popleft())
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _map_result(self, task: tasks.Task[_T]) -> _T:
+        if not task.done():
+            assert self._loop is not None
+            waiter = self._loop.create_future()
+
+            def wakeup(_):
+                if not waiter.done():
+                    waiter.set_result(None)
+
+            task.add_done_callback(wakeup)
+            try:
+                await waiter
+            finally:
+                task.remove_done_callback(wakeup)
+
+        if self._aborting:
+            # the abort already requested cancellation of the parent task,
+            # let it land here rather than surfacing the child's error twice
+            await tasks.sleep(0)
+            raise RuntimeError(f"TaskGroup {self!r} is shutting down")
+        return task.result()
+
+    async def as_completed(self) -> AsyncGenerator[tuple[tasks.Task[Any], Any], None]:
+        """Yield (task, result) for each child as it completes successfully.
+
+        Children created while iterating are included; iteration ends once
+        the group has no children left. Only children that complete while
+        the iterator is running are seen, and nothing is kept once it has
+        been yielded, so a long running group consumed this way holds a
+        constant amount of memory. Cancelled children are skipped.
+
+        A failing child aborts the group as usual and its error is raised
+        from __aexit__; the iterator itself stops with the cancellation
+        that abort delivers.
+        """
+        if self._completed is not None:
+            raise RuntimeError(f"TaskGroup {self!r} is already being iterated")
+        if not self._entered:
+            raise RuntimeError(f"TaskGroup {self!r} has not been entered")
+        assert self._loop is not None
+        completed = self._completed = collections.deque()
+        try:
+            while True:
+                if self._aborting:
+                    # see _map_result()
+                    await tasks.sleep(0)
+                    raise RuntimeError(f"TaskGroup {self!r} is shutting down")
+                if completed:
+                    task = completed.popleft()
+                    yield task, task.result()
+                    del task
+                    continue
+                if not self._tasks:
+                    return
+                self._completed_waiter = self._loop.create_future()
+                try:
+                    await self._completed_waiter
+                finally:
+                    self._completed_waiter = None
+        finally:
+            self._completed = None
+
     # Since Python 3.8 Tasks propagate all exceptions correctly,
     # except for KeyboardInterrupt and SystemExit which are
     # still considered special.
@@ -189,27 +550,91 @@ class TaskGroup:
         assert isinstance(exc, BaseException)
         return isinstance(exc, (SystemExit, KeyboardInterrupt))
 
+    def _notify(self, hook: str, *args: Any) -> None:
+        for instrument in self._instruments:
+            try:
+                getattr(instrument, hook)(self, *args)
+            except Exception as exc:
+                assert self._loop is not None
+                self._loop.call_exception_handler({
+                    'message': f'Instrument {instrument!r} raised in {hook}()',
+                    'exception': exc,
+                })
+
     def _abort(self) -> None:
         self._aborting = True
+        if self._instruments:
+            self._notify("group_aborting")
 
-        for t in self._tasks:
-            if not t.done():
+        if len(self._tasks) <= _ABORT_BATCH:
+            for t in self._tasks:
+                if not t.done():
+                    t.cancel()
+        else:
+            # every cancelled child wakes up in the next loop iteration:
+            # spread the cancellations out so a huge group does not stall
+            # the loop for one long iteration
+            self._cancel_batch(list(self._tasks), 0)
+
+        for fut in self._spawn_waiters:
+            if not fut.done():
+                fut.set_exception(
+                    RuntimeError(f"TaskGroup {self!r} is shutting down"))
+
+    def _cancel_batch(self, children: list[tasks.Task[Any] | None], start: int) -> None:
+        end = min(start + _ABORT_BATCH, len(children))
+        for i in range(start, end):
+            t = children[i]
+            # don't keep finished children alive until the last batch
+            children[i] = None
+            if t is not None and not t.done():
                 t.cancel()
+        if end < len(children):
+            assert self._loop is not None
+            self._loop.call_soon(self._cancel_batch, children, end)
+
+    def _on_driver_done(self, task):
+        # the start_soon() driver is waited for like a child, but is not
+        # one to as_completed(), instruments or accounting
+        self._tasks.discard(task)
+        self._wake_waiters()
+        if not task.cancelled() and task.exception() is not None:
+            self._child_failed(task, task.exception())
 
     def _on_task_done(self, task):
         self._tasks.discard(task)
 
-        if self._on_completed_fut is not None and not self._tasks:
-            if not self._on_completed_fut.done():
-                self._on_completed_fut.set_result(True)
+        if self._stats is not None and task._stats is not None:
+            self._stats.add(task._stats, task.get_name())
+
+        if self._instruments:
+            self._notify("task_done", task)
+
+        self._wake_waiters()
 
         if task.cancelled():
             return
 
         exc = task.exception()
         if exc is None:
+            if self._completed is not None:
+                self._completed.append(task)
             return
 
+        self._child_failed(task, exc)
+
+    def _wake_waiters(self):
+        if self._spawn_waiters:
+            self._wake_spawn_waiters()
+
+        if self._completed_waiter is not None and not self._completed_waiter.done():
+            self._completed_waiter.set_result(None)
+
+        if self._on_completed_fut is not None and not self._tasks:
+            if not self._on_completed_fut.done():
+                self._on_completed_fut.set_result(True)
+
+    def _child_failed(self, task, exc):
         assert self._errors is not None
         self._errors.append(exc)
         if self._is_base_error(exc) and self._base_error is None:
@@ -250,3 +675,7 @@ class TaskGroup:
             self._abort()
             self._parent_cancel_requested = True
             self._parent_task.cancel()
+
+
+if sys.version_info < (3, 11):
+    _install.wrap_uncancel(TaskGroup)
@@ -1,13 +1,96 @@
+from __future__ import annotations
+
 import asyncio
 import collections.abc
 import contextvars
+import sys
+import time
+from asyncio import coroutines, futures, tasks
 from typing import Any, Awaitable, TypeVar, cast
 
 _YieldT = TypeVar("_YieldT")
 _SendT = TypeVar("_SendT")
 _ReturnT = TypeVar("_ReturnT", covariant=True)
 
-class _Interceptor(collections.abc.Coroutine[_YieldT, _SendT, _ReturnT]):
+class TaskStats:
+    """How much event loop time a task has used.
+
+    steps counts the steps of the task's coroutine, time is their total
+    duration in seconds and max_step the longest one: a step holds the
+    loop from the moment the coroutine is resumed until it next suspends.
+
+    last_step_end is the time.perf_counter() at which the last step ended,
+    so while the task is suspended it tells how long it has been waiting.
+
+    A TaskGroup rolls the stats of its finished children into one
+    TaskStats, which also records max_step_name, the name of the child
+    that took the longest step.
+    """
+
+    __slots__ = ("steps", "time", "max_step", "max_step_name", "last_step_end")
+
+    def __init__(self) -> None:
+        self.steps = 0
+        self.time = 0.0
+        self.max_step = 0.0
+        self.max_step_name: str | None = None
+        self.last_step_end: float | None = None
+
+    def __repr__(self) -> str:
+        return f"<TaskStats steps={self.steps} time={self.time:.6f} max_step={self.max_step:.6f}>"
+
+    def add(self, other: TaskStats, name: str | None = None) -> None:
+        """Add other's numbers to these; name is the task other belongs to."""
+        self.steps += other.steps
+        self.time += other.time
+        if other.max_step > self.max_step:
+            self.max_step = other.max_step
+            self.max_step_name = other.max_step_name if name is None else name
+
+
+class _Wrapper(collections.abc.Coroutine[_YieldT, _SendT, _ReturnT]):
+    __slots__ = ("_coro",)
+
+    def __await__(self):  # type: ignore[override]
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.send(None)  # type: ignore
+
+    def close(self) -> None:
+        self._coro.close()
+
+    # introspection used by asyncio's Task repr and get_stack()
+
+    @property
+    def __name__(self):  # type: ignore[override]
+        coro = self._coro
+        return getattr(coro, "__qualname__", None) or getattr(coro, "__name__", type(coro).__name__)
+
+    @property
+    def cr_frame(self):
+        coro = self._coro
+        return getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+
+    @property
+    def cr_await(self):
+        coro = self._coro
+        return getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+
+    @property
+    def cr_running(self):
+        coro = self._coro
+        return getattr(coro, "cr_running", False) or getattr(coro, "gi_running", False)
+
+
+class _Interceptor(_Wrapper[_YieldT, _SendT, _ReturnT]):
+    # only used where asyncio.Task does not take context= (3.10): runs each
+    # step of the wrapped coroutine in the given context
+    __slots__ = ("_context",)
+
     def __init__(
         self,
         coro: (
@@ -16,55 +99,215 @@ class _Interceptor(collections.abc.Coroutine[_YieldT, _SendT, _ReturnT]):
         ),
         context: contextvars.Context,
     ):
-        self.__coro = coro
-        self.__context = context
+        self._coro = coro
+        self._context = context
 
     def send(self, v: _SendT):
-        return self.__context.run(self.__coro.send, v)
+        return self._context.run(self._coro.send, v)
 
-    def throw(self, e: BaseException):
-        return self.__context.run(self.__coro.throw, e)
+    def throw(self, *exc_info: Any):
+        return self._context.run(self._coro.throw, *exc_info)
 
-    def __getattr__(self, name):
-        return getattr(self.__coro, name)
 
+class _Meter(_Wrapper[_YieldT, _SendT, _ReturnT]):
+    # times each step of the wrapped coroutine into a TaskStats
+    __slots__ = ("_stats",)
 
-class Task(asyncio.Task[_ReturnT]):
     def __init__(
         self,
         coro: (
-            Awaitable[_ReturnT]
-            | collections.abc.Coroutine[_YieldT, _SendT, _ReturnT]
+            collections.abc.Coroutine[_YieldT, _SendT, _ReturnT]
             | collections.abc.Generator[_YieldT, _SendT, _ReturnT]
         ),
-        *args,
-        context=None,
-        **kwargs
-    ) -> None:
-        self._num_cancels_requested = 0
-        if context is not None:
-            assert isinstance(coro, (collections.abc.Coroutine, collections.abc.Generator))
-            coro = _Interceptor(coro, context)
-        super().__init__(coro, *args, **kwargs)  # type: ignore
-
-    def cancel(self, *args: Any, **kwargs: Any) -> bool:
-        if not self.done():
-            self._num_cancels_requested += 1
-        return super().cancel(*args, **kwargs)
-
-    def cancelling(self) -> int:
-        return self._num_cancels_requested
-
-    def uncancel(self) -> int:
-        if self._num_cancels_requested > 0:
-            self._num_cancels_requested -= 1
-        return self._num_cancels_requested
-
-    def get_coro(self) -> collections.abc.Generator[Any, Any, _ReturnT] | collections.abc.Awaitable[_ReturnT]:
+        stats: TaskStats,
+    ):
+        self._coro = coro
+        self._stats = stats
+
+    def send(self, v: _SendT):
+        start = time.perf_counter()
+        try:
+            return self._coro.send(v)
+        finally:
+            self._record(start, time.perf_counter())
+
+    def throw(self, *exc_info: Any):
+        start = time.perf_counter()
+        try:
+            return self._coro.throw(*exc_info)
+        finally:
+            self._record(start, time.perf_counter())
+
+    def _record(self, start: float, end: float) -> None:
+        stats = self._stats
+        elapsed = end - start
+        stats.steps += 1
+        stats.time += elapsed
+        stats.last_step_end = end
+        if elapsed > stats.max_step:
+            stats.max_step = elapsed
+
+
+class Task(asyncio.Task[_ReturnT]):
+    # 3.11+ asyncio.Task counts cancellation requests and takes context=
+    # natively, so there this adds nothing to the C implementation
+    if sys.version_info >= (3, 11):
+        __slots__ = ()
+    else:
+        __slots__ = ("_num_cancels_requested",)
+
+        def __init__(
+            self,
+            coro: (
+                Awaitable[_ReturnT]
+                | collections.abc.Coroutine[_YieldT, _SendT, _ReturnT]
+                | collections.abc.Generator[_YieldT, _SendT, _ReturnT]
+            ),
+            *args,
+            context=None,
+            **kwargs
+        ) -> None:
+            self._num_cancels_requested = 0
+            if context is not None:
+                assert isinstance(coro, (collections.abc.Coroutine, collections.abc.Generator))
+                coro = _Interceptor(coro, context)
+            super().__init__(coro, *args, **kwargs)  # type: ignore
+
+        def cancel(self, *args: Any, **kwargs: Any) -> bool:
+            if not self.done():
+                self._num_cancels_requested += 1
+            return super().cancel(*args, **kwargs)
+
+        def cancelling(self) -> int:
+            return self._num_cancels_requested
+
+        def uncancel(self) -> int:
+            if self._num_cancels_requested > 0:
+                self._num_cancels_requested -= 1
+            return self._num_cancels_requested
+
+        def get_coro(self) -> collections.abc.Generator[Any, Any, _ReturnT] | collections.abc.Awaitable[_ReturnT]:
+            coro = super().get_coro()
+            while isinstance(coro, _Wrapper):
+                coro = coro._coro
+            return coro
+
+
+class MeteredTask(Task[_ReturnT]):
+    """A Task that times every step of its coroutine into stats.
+
+    TaskGroup(accounting=True) creates its children as MeteredTask; with
+    stats=None this is an ordinary Task.
+    """
+
+    __slots__ = ("_stats",)
+
+    def __init__(self, coro: Any, *args: Any, stats: TaskStats | None = None, **kwargs: Any) -> None:
+        self._stats = stats
+        if stats is not None:
+            coro = _Meter(coro, stats)
+        super().__init__(coro, *args, **kwargs)
+
+    @property
+    def stats(self) -> TaskStats | None:
+        return self._stats
+
+    def get_coro(self):  # type: ignore[override]
         coro = super().get_coro()
-        if isinstance(coro, _Interceptor):
-            return coro._Interceptor__coro  # type: ignore
+        while isinstance(coro, _Wrapper):
+            coro = coro._coro
         return coro
 
+
+class PriorityTask(MeteredTask[_ReturnT]):
+    # a Task with a scheduling priority: on a loop made by
+    # taskgroup.scheduler.priority_loop_factory its steps run before those
+    # of lower priority tasks, elsewhere it is an ordinary Task. A
+    # MeteredTask so that TaskGroup(accounting=True) can give it stats=
+    __slots__ = ("_priority",)
+
+    def __init__(self, coro: Any, *args: Any, priority: int = 0, **kwargs: Any) -> None:
+        # set before Task.__init__ schedules the first step
+        self._priority = priority
+        super().__init__(coro, *args, **kwargs)
+
+    @property
+    def priority(self) -> int:
+        return self._priority
+
+
+if sys.version_info < (3, 12):
+    # the C Task always schedules its first step with call_soon, so an eager
+    # Task has to be driven by the pure python implementation. This mirrors
+    # Task.__init__ and Task.__eager_start from cpython 3.12
+    class EagerTask(tasks._PyTask):  # type: ignore
+        def __init__(self, coro, *, loop=None, name=None, context=None):
+            futures._PyFuture.__init__(self, loop=loop)  # type: ignore
+            if self._source_traceback:
+                del self._source_traceback[-1]
+            if not coroutines.iscoroutine(coro):
+                # raise after Future.__init__(), attrs are required for __del__
+                # prevent logging for pending task in __del__
+                self._log_destroy_pending = False
+                raise TypeError(f"a coroutine was expected, got {coro!r}")
+
+            if name is None:
+                self._name = f"Task-{tasks._task_name_counter()}"  # type: ignore
+            else:
+                self._name = str(name)
+
+            self._num_cancels_requested = 0
+            self._must_cancel = False
+            self._fut_waiter = None
+            self._coro = coro
+            if context is None:
+                self._context = contextvars.copy_context()
+            else:
+                self._context = context
+
+            tasks._register_task(self)
+            self.__eager_start()
+
+        def __eager_start(self):
+            loop = self._loop
+            prev_task = tasks.current_task(loop)
+            if prev_task is not None:
+                tasks._leave_task(loop, prev_task)  # type: ignore
+            try:
+                self._context.run(self._Task__step)  # type: ignore
+            finally:
+                if prev_task is not None:
+                    tasks._enter_task(loop, prev_task)  # type: ignore
+                if self.done():
+                    self._coro = None
+                    self = None  # Needed to break cycles when an exception occurs.
+
+        if sys.version_info < (3, 11):
+            def cancel(self, *args: Any, **kwargs: Any) -> bool:
+                if not self.done():
+                    self._num_cancels_requested += 1
+                return super().cancel(*args, **kwargs)
+
+            def cancelling(self) -> int:
+                return self._num_cancels_requested
+
+            def uncancel(self) -> int:
+                if self._num_cancels_requested > 0:
+                    self._num_cancels_requested -= 1
+                return self._num_cancels_requested
+
+
 def task_factory(loop: asyncio.AbstractEventLoop, coro: collections.abc.Coroutine[Any, Any, _ReturnT] | collections.abc.Generator[Any, Any, _ReturnT], **kwargs: Any) -> Task[_ReturnT]:
     return Task(coro, loop=loop, **kwargs)
+
+
+def eager_task_factory(loop: asyncio.AbstractEventLoop, coro: collections.abc.Coroutine[Any, Any, _ReturnT] | collections.abc.Generator[Any, Any, _ReturnT], **kwargs: Any) -> asyncio.Task[_ReturnT]:
+    """Task factory that starts the coroutine eagerly.
+
+    The coroutine runs synchronously inside the factory call until it first
+    suspends; if it completes (or raises) without suspending, the returned
+    task is already done and never goes through the event loop.
+    """
+    if sys.version_info >= (3, 12):
+        return asyncio.Task(coro, loop=loop, eager_start=True, **kwargs)  # type: ignore
+    return EagerTask(coro, loop=loop, **kwargs)
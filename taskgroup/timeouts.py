@@ -1,9 +1,9 @@
 # backported from cpython 3.12 bceb197947bbaebb11e01195bdce4f240fdf9332
 # Copyright © 2001-2022 Python Software Foundation; All Rights Reserved
-# modified to support working on 3.10 (basically just the imports changed here)
+# modified to support working on 3.10, and to skip loop timers that an
+# enclosing Timeout in the same task makes redundant
 
-import collections.abc
-import contextlib
+import contextvars
 import enum
 import sys
 from types import TracebackType
@@ -12,7 +12,11 @@ from typing import Union, final, Optional, Type
 from asyncio import events
 from asyncio import exceptions
 from asyncio import tasks
-from . import install as _install
+from . import timerwheel as _timerwheel
+from . import tree as _tree
+
+if sys.version_info < (3, 11):
+    from . import install as _install
 
 from typing_extensions import Self
 
@@ -20,6 +24,14 @@ __all__ = (
     "Timeout",
     "timeout",
     "timeout_at",
+    "move_on_after",
+    "move_on_at",
+)
+
+
+# innermost active Timeout of the running task
+_current_timeout: contextvars.ContextVar[Optional["Timeout"]] = contextvars.ContextVar(
+    "taskgroup_current_timeout", default=None
 )
 
 
@@ -33,14 +45,26 @@ class _State(enum.Enum):
 
 @final
 class Timeout:
+    """Timeout scope, created by timeout(), timeout_at(), move_on_after()
+    and move_on_at().
 
-    def __init__(self, when: Optional[float]) -> None:
+    When it expires the task is cancelled, and the scope turns the
+    CancelledError into a TimeoutError on exit. With move_on=True it
+    swallows the CancelledError instead, creating no TimeoutError, and
+    sets cancelled_caught so that the code after the block can tell.
+    """
+
+    def __init__(self, when: Optional[float], *, move_on: bool = False) -> None:
         self._state = _State.CREATED
+        self._move_on = move_on
+        self.cancelled_caught = False
 
-        self._timeout_handler: Optional[Union[events.TimerHandle, events.Handle]] = None
+        self._timeout_handler: Optional[Union[events.TimerHandle, events.Handle, _timerwheel.TimerWheelHandle]] = None
         self._task: Optional[tasks.Task] = None
         self._when = when
-        self._cmgr = self._cmgr_factory()
+        # enclosing and directly nested active Timeouts in the same task
+        self._outer: Optional[Timeout] = None
+        self._inner: Optional[Timeout] = None
 
     def when(self) -> Optional[float]:
         return self._when
@@ -56,15 +80,48 @@ class Timeout:
 
         if self._timeout_handler is not None:
             self._timeout_handler.cancel()
+            self._timeout_handler = None
+
+        self._arm()
+        self._arm_inner()
+
+    def _arm(self) -> None:
+        when = self._when
+        if when is not None:
+            outer = self._outer
+            while outer is not None:
+                if (outer._state is _State.ENTERED
+                        and outer._when is not None
+                        and outer._when < when):
+                    # an enclosing scope cancels the task before we would,
+                    # so our timer could never fire first. On a tie both
+                    # must fire, for each scope to see itself expired
+                    when = None
+                    break
+                outer = outer._outer
 
         if when is None:
-            self._timeout_handler = None
-        else:
+            if self._timeout_handler is not None:
+                self._timeout_handler.cancel()
+                self._timeout_handler = None
+        elif self._timeout_handler is None:
             loop = events.get_running_loop()
             if when <= loop.time():
                 self._timeout_handler = loop.call_soon(self._on_timeout)
             else:
-                self._timeout_handler = loop.call_at(when, self._on_timeout)
+                wheel = _timerwheel.get_timer_wheel(loop)
+                if wheel is None:
+                    self._timeout_handler = loop.call_at(when, self._on_timeout)
+                else:
+                    self._timeout_handler = wheel.call_at(when, self._on_timeout)
+
+    def _arm_inner(self) -> None:
+        # our deadline bounds every scope nested inside us, re-evaluate them
+        inner = self._inner
+        while inner is not None:
+            if inner._state is _State.ENTERED:
+                inner._arm()
+            inner = inner._inner
 
     def expired(self) -> bool:
         """Is timeout expired during execution?"""
@@ -75,40 +132,31 @@ class Timeout:
         if self._state is _State.ENTERED:
             when = round(self._when, 3) if self._when is not None else None
             info.append(f"when={when}")
+        if self._move_on:
+            info.append("move_on")
         info_str = ' '.join(info)
         return f"<Timeout [{self._state.value}]{info_str}>"
 
-    @contextlib.asynccontextmanager
-    async def _cmgr_factory(self) -> collections.abc.AsyncGenerator[Self, None]:
+    async def __aenter__(self) -> Self:
+        if self._state is not _State.CREATED:
+            raise RuntimeError("Timeout has already been entered")
         self._state = _State.ENTERED
-        async with _install.install_uncancel():
-            self._task = tasks.current_task()
-            if self._task is None:
-                raise RuntimeError("Timeout should be used inside a task")
-            self._cancelling = self._task.cancelling()
-            self.reschedule(self._when)
-            try:
-                yield self
-            finally:
-                exc_type, exc_value, _ = sys.exc_info()
-                assert self._state in (_State.ENTERED, _State.EXPIRING)
-
-                if self._timeout_handler is not None:
-                    self._timeout_handler.cancel()
-                    self._timeout_handler = None
-
-                if self._state is _State.EXPIRING:
-                    self._state = _State.EXPIRED
-
-                    if self._task.uncancel() <= self._cancelling and exc_type is exceptions.CancelledError:
-                        # Since there are no outstanding cancel requests, we're
-                        # handling this.
-                        raise TimeoutError from exc_value
-                elif self._state is _State.ENTERED:
-                    self._state = _State.EXITED
-
-    async def __aenter__(self) -> "Timeout":
-        return await self._cmgr.__aenter__()
+        self._task = tasks.current_task()
+        if self._task is None:
+            raise RuntimeError("Timeout should be used inside a task")
+        self._cancelling = self._task.cancelling()
+        outer = _current_timeout.get()
+        if (outer is not None
+                and outer._task is self._task
+                and outer._state in (_State.ENTERED, _State.EXPIRING)
+                and outer._inner is None):
+            self._outer = outer
+            outer._inner = self
+        _current_timeout.set(self)
+        if _tree._enabled:
+            _tree._timeouts.add(self)
+        self.reschedule(self._when)
+        return self
 
     async def __aexit__(
         self,
@@ -116,7 +164,35 @@ class Timeout:
         exc_val: Optional[BaseException],
         exc_tb: Optional[TracebackType],
     ) -> Optional[bool]:
-        return await self._cmgr.__aexit__(exc_type, exc_val, exc_tb)
+        assert self._state in (_State.ENTERED, _State.EXPIRING)
+        assert self._task is not None
+
+        if _tree._enabled:
+            _tree._timeouts.discard(self)
+        if self._timeout_handler is not None:
+            self._timeout_handler.cancel()
+            self._timeout_handler = None
+
+        if _current_timeout.get() is self:
+            _current_timeout.set(self._outer)
+        if self._outer is not None:
+            self._outer._inner = None
+            self._outer = None
+
+        if self._state is _State.EXPIRING:
+            self._state = _State.EXPIRED
+
+            if self._task.uncancel() <= self._cancelling and exc_type is exceptions.CancelledError:
+                # Since there are no outstanding cancel requests, we're
+                # handling this.
+                if self._move_on:
+                    self.cancelled_caught = True
+                    return True
+                raise TimeoutError from exc_val
+        elif self._state is _State.ENTERED:
+            self._state = _State.EXITED
+
+        return None
 
     def _on_timeout(self) -> None:
         assert self._state is _State.ENTERED
@@ -125,6 +201,12 @@ class Timeout:
         self._state = _State.EXPIRING
         # drop the reference early
         self._timeout_handler = None
+        # nested scopes no longer have our deadline to rely on
+        self._arm_inner()
+
+
+if sys.version_info < (3, 11):
+    _install.wrap_uncancel(Timeout)
 
 
 def timeout(delay: Optional[float]) -> Timeout:
@@ -167,3 +249,28 @@ def timeout_at(when: Optional[float]) -> Timeout:
     into TimeoutError.
     """
     return Timeout(when)
+
+
+def move_on_after(delay: Optional[float]) -> Timeout:
+    """Timeout async context manager that stops the block without raising.
+
+    Like timeout(), but when the deadline passes the block is interrupted
+    and execution simply continues after it; cancelled_caught tells
+    whether that happened:
+
+    >>> async with taskgroup.move_on_after(1) as scope:
+    ...     await poll()
+    >>> if scope.cancelled_caught:
+    ...     ...
+
+    Only the scope's own expiry is swallowed: when the task is also being
+    cancelled from elsewhere, or an enclosing timeout expired, the
+    CancelledError propagates as usual.
+    """
+    loop = events.get_running_loop()
+    return Timeout(loop.time() + delay if delay is not None else None, move_on=True)
+
+
+def move_on_at(when: Optional[float]) -> Timeout:
+    """Like move_on_after(), with an absolute deadline as timeout_at()."""
+    return Timeout(when, move_on=True)
@@ -0,0 +1,254 @@
+"""
+hierarchical timing wheel that Timeout can use instead of the loop's heap
+"""
+
+from __future__ import annotations
+
+__all__ = ["TimerWheel", "TimerWheelHandle", "install_timer_wheel", "get_timer_wheel"]
+
+import weakref
+from asyncio import AbstractEventLoop, events
+from collections.abc import Callable
+from typing import Any
+
+_SLOT_BITS = 6
+_SLOTS = 1 << _SLOT_BITS
+_SLOT_MASK = _SLOTS - 1
+_LEVELS = 4
+
+_wheels: weakref.WeakKeyDictionary[AbstractEventLoop, TimerWheel] = weakref.WeakKeyDictionary()
+
+
+class TimerWheelHandle:
+    __slots__ = ("_when", "_tick", "_callback", "_args", "_bucket", "_level", "_wheel")
+
+    def __init__(self, when: float, tick: int, callback: Callable[..., object], args: tuple[Any, ...], wheel: TimerWheel) -> None:
+        self._when = when
+        self._tick = tick
+        self._callback: Callable[..., object] | None = callback
+        self._args = args
+        self._bucket: dict[TimerWheelHandle, None] | None = None
+        self._level = 0
+        self._wheel = wheel
+
+    def __repr__(self) -> str:
+        state = " cancelled" if self._callback is None else ""
+        return f"<TimerWheelHandle{state} when={self._when}>"
+
+    def when(self) -> float:
+        return self._when
+
+    def cancelled(self) -> bool:
+        return self._callback is None
+
+    def cancel(self) -> None:
+        bucket = self._bucket
+        if bucket is not None:
+            del bucket[self]
+            self._bucket = None
+            wheel = self._wheel
+            wheel._count -= 1
+            wheel._level_counts[self._level] -= 1
+        self._callback = None
+        self._args = ()
+
+
+class TimerWheel:
+    """Coalesce many timers into one loop timer per tick.
+
+    Timers live in a hierarchical timing wheel of 4 levels of 64 slots, so
+    call_at() and cancel() are O(1) however many timers are pending, and
+    the loop's heap only ever holds the wheel's own timer. Deadlines are
+    rounded up to a multiple of resolution: a timer never fires early, but
+    may fire up to one resolution late.
+
+    The wheel only wakes for ticks that have something due (or that need
+    a higher level cascaded), and schedules nothing while it is empty.
+    """
+
+    def __init__(self, loop: AbstractEventLoop, *, resolution: float = 0.01) -> None:
+        if resolution <= 0:
+            raise ValueError(f"resolution must be > 0, got {resolution!r}")
+        # the wheel is the value of a WeakKeyDictionary keyed by the loop
+        self._loop_ref = weakref.ref(loop)
+        self._resolution = resolution
+        self._levels: list[list[dict[TimerWheelHandle, None]]] = [
+            [{} for _ in range(_SLOTS)] for _ in range(_LEVELS)
+        ]
+        self._level_counts = [0] * _LEVELS
+        self._count = 0
+        # every tick up to and including self._tick has been processed
+        self._tick = int(loop.time() / resolution)
+        self._timer: events.TimerHandle | None = None
+        self._timer_tick = 0
+
+    def __repr__(self) -> str:
+        return f"<TimerWheel resolution={self._resolution} timers={self._count}>"
+
+    def __len__(self) -> int:
+        return self._count
+
+    def resolution(self) -> float:
+        return self._resolution
+
+    def call_at(self, when: float, callback: Callable[..., object], *args: Any) -> TimerWheelHandle:
+        """Like loop.call_at(), rounded up to the wheel's resolution."""
+        if not self._count:
+            # nothing was pending so self._tick may be stale
+            loop = self._loop_ref()
+            assert loop is not None
+            self._tick = max(self._tick, int(loop.time() / self._resolution))
+        tick = int(when / self._resolution)
+        if tick * self._resolution < when:
+            tick += 1
+        if tick <= self._tick:
+            tick = self._tick + 1
+        handle = TimerWheelHandle(when, tick, callback, args, self)
+        self._count += 1
+        self._insert(handle)
+        if self._timer is None or tick < self._timer_tick:
+            self._arm()
+        return handle
+
+    def call_later(self, delay: float, callback: Callable[..., object], *args: Any) -> TimerWheelHandle:
+        loop = self._loop_ref()
+        assert loop is not None
+        return self.call_at(loop.time() + delay, callback, *args)
+
+    def close(self) -> None:
+        """Cancel every pending timer and the wheel's loop timer."""
+        for level in self._levels:
+            for bucket in level:
+                for handle in list(bucket):
+                    handle.cancel()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        loop = self._loop_ref()
+        if loop is not None and _wheels.get(loop) is self:
+            del _wheels[loop]
+
+    def _insert(self, handle: TimerWheelHandle) -> None:
+        tick = handle._tick
+        current = self._tick
+        shift = 0
+        for level in range(_LEVELS):
+            if (tick >> shift) - (current >> shift) < _SLOTS:
+                break
+            shift += _SLOT_BITS
+        else:
+            # beyond the wheel's range: park it in the furthest top level
+            # slot, it is re-inserted when that slot cascades
+            level = _LEVELS - 1
+            shift -= _SLOT_BITS
+            tick = ((current >> shift) + _SLOT_MASK) << shift
+        bucket = self._levels[level][(tick >> shift) & _SLOT_MASK]
+        bucket[handle] = None
+        handle._bucket = bucket
+        handle._level = level
+        self._level_counts[level] += 1
+
+    def _arm(self) -> None:
+        if not self._count:
+            return
+        # higher levels only need attention when level 0 wraps
+        tick = ((self._tick >> _SLOT_BITS) + 1) << _SLOT_BITS
+        if self._level_counts[0]:
+            buckets = self._levels[0]
+            first = self._tick + 1
+            while first < tick and not buckets[first & _SLOT_MASK]:
+                first += 1
+            tick = first
+        timer = self._timer
+        if timer is not None:
+            if self._timer_tick == tick:
+                return
+            timer.cancel()
+        loop = self._loop_ref()
+        if loop is None:
+            return
+        self._timer_tick = tick
+        self._timer = loop.call_at(tick * self._resolution, self._run)
+
+    def _cascade(self, level: int, ready: list[TimerWheelHandle]) -> None:
+        shift = _SLOT_BITS * level
+        bucket = self._levels[level][(self._tick >> shift) & _SLOT_MASK]
+        if not bucket:
+            return
+        self._level_counts[level] -= len(bucket)
+        handles = list(bucket)
+        bucket.clear()
+        for handle in handles:
+            if handle._tick <= self._tick:
+                handle._bucket = None
+                ready.append(handle)
+            else:
+                self._insert(handle)
+
+    def _run(self) -> None:
+        loop = self._loop_ref()
+        assert loop is not None
+        self._timer = None
+        # the loop may run us a hair before the tick boundary
+        now_tick = max(self._timer_tick, int(loop.time() / self._resolution))
+        ready: list[TimerWheelHandle] = []
+        while self._tick < now_tick and self._count > len(ready):
+            self._tick += 1
+            tick = self._tick
+            if not tick & _SLOT_MASK:
+                # cascade from the highest level that wrapped downwards so
+                # each timer settles in its final slot
+                level = 1
+                mask = (_SLOTS << _SLOT_BITS) - 1
+                while level < _LEVELS - 1 and not tick & mask:
+                    level += 1
+                    mask = (mask << _SLOT_BITS) | _SLOT_MASK
+                for lvl in range(level, 0, -1):
+                    self._cascade(lvl, ready)
+            bucket = self._levels[0][tick & _SLOT_MASK]
+            if bucket:
+                self._level_counts[0] -= len(bucket)
+                for handle in bucket:
+                    handle._bucket = None
+                ready.extend(bucket)
+                bucket.clear()
+        if self._tick < now_tick:
+            self._tick = now_tick
+        self._count -= len(ready)
+        self._arm()
+
+        for handle in ready:
+            callback = handle._callback
+            if callback is None:
+                continue
+            args = handle._args
+            handle._callback = None
+            handle._args = ()
+            try:
+                callback(*args)
+            except (SystemExit, KeyboardInterrupt):
+                raise
+            except BaseException as exc:
+                loop.call_exception_handler({
+                    'message': f'Exception in timer wheel callback {callback!r}',
+                    'exception': exc,
+                    'handle': handle,
+                })
+
+
+def install_timer_wheel(loop: AbstractEventLoop | None = None, *, resolution: float = 0.01) -> TimerWheel:
+    """Make every Timeout on loop register with a shared TimerWheel.
+
+    Defaults to the running loop. If a wheel is already installed on the
+    loop it is returned unchanged.
+    """
+    if loop is None:
+        loop = events.get_running_loop()
+    wheel = _wheels.get(loop)
+    if wheel is None:
+        wheel = _wheels[loop] = TimerWheel(loop, resolution=resolution)
+    return wheel
+
+
+def get_timer_wheel(loop: AbstractEventLoop) -> TimerWheel | None:
+    return _wheels.get(loop)
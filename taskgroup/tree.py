@@ -0,0 +1,150 @@
+"""
+registry of active TaskGroups and Timeouts, and a dump of the task tree
+"""
+
+from __future__ import annotations
+
+__all__ = ["enable", "format_tree", "print_tree"]
+
+import sys
+import time
+import weakref
+from asyncio import AbstractEventLoop, events, tasks
+from typing import TYPE_CHECKING, Any, TextIO
+
+if TYPE_CHECKING:
+    from .taskgroups import TaskGroup
+    from .timeouts import Timeout
+
+# once enabled: entered TaskGroups that have not finished waiting for their
+# children, and Timeouts inside their async with block; of every loop in the
+# process. Weak, so that a group whose __aexit__ never finishes is not kept
+# alive by them
+_enabled = False
+_groups: weakref.WeakSet[TaskGroup] = weakref.WeakSet()
+_timeouts: weakref.WeakSet[Timeout] = weakref.WeakSet()
+
+
+def enable() -> None:
+    """Register TaskGroups and Timeouts entered from now on for format_tree().
+
+    Registration costs every enter and exit a little, so it is off until
+    this is called, by Runner(dump_signal=...) or by hand. It cannot be
+    turned off again.
+    """
+    global _enabled
+    _enabled = True
+
+
+def _await_point(coro: Any) -> Any:
+    # follow the chain of awaits to the innermost suspended frame
+    frame = None
+    while coro is not None:
+        f = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if f is None:
+            break
+        frame = f
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frame
+
+
+def _format_task(task: tasks.Task[Any], current: tasks.Task[Any] | None, clock: float) -> str:
+    line = f"{task.get_name()!r}"
+    coro = task.get_coro()
+    frame = _await_point(coro)
+    if frame is not None:
+        code = frame.f_code
+        line += f" at {code.co_filename}:{frame.f_lineno} in {code.co_name}"
+    elif coro is not None:
+        line += f" in {getattr(coro, '__qualname__', None) or type(coro).__name__}"
+    if task is current:
+        return line + " (running)"
+    waiter = getattr(task, "_fut_waiter", None)
+    if waiter is not None:
+        line += f" awaiting {type(waiter).__name__}"
+    stats = getattr(task, "_stats", None)
+    if stats is not None and stats.last_step_end is not None:
+        line += f" for {clock - stats.last_step_end:.3f}s"
+    return line
+
+
+def format_tree(loop: AbstractEventLoop | None = None) -> str:
+    """Render loop's pending tasks as a tree, default the running loop.
+
+    Each TaskGroup is shown under the task that entered it, with its
+    children under it, and each active Timeout under its task with the
+    time left until it expires. A task is shown with the line it is
+    suspended at and the type of future it awaits there; tasks created with
+    TaskGroup(accounting=True) also show how long they have been waiting.
+    Tasks that belong to no TaskGroup are the roots of the tree.
+
+    Only TaskGroups and Timeouts entered since enable() was called are
+    known, before that every task is shown as a root.
+
+    Call this on the loop's thread: it takes a snapshot of the tree in a
+    single pass, without awaiting.
+    """
+    if loop is None:
+        loop = events.get_running_loop()
+    now = loop.time()
+    clock = time.perf_counter()
+    current = tasks.current_task(loop) if loop.is_running() else None
+
+    # other loops may be changing the registry from their threads, copying
+    # the underlying set of references does not run any python code so
+    # cannot see it change
+    groups_of: dict[Any, list[TaskGroup]] = {}
+    owned = set()
+    for ref in list(_groups.data):  # type: ignore[attr-defined]
+        group = ref()
+        if group is not None and group._loop is loop:
+            groups_of.setdefault(group._parent_task, []).append(group)
+            owned.update(group._tasks)
+    timeouts_of: dict[Any, list[Timeout]] = {}
+    for ref in list(_timeouts.data):  # type: ignore[attr-defined]
+        scope = ref()
+        task = None if scope is None else scope._task
+        if scope is not None and task is not None and task.get_loop() is loop:
+            timeouts_of.setdefault(task, []).append(scope)
+
+    def deadline(scope: Timeout) -> float:
+        when = scope.when()
+        return float("inf") if when is None else when
+
+    def name(task: tasks.Task[Any]) -> str:
+        return task.get_name()
+
+    lines = []
+    roots = sorted((t for t in tasks.all_tasks(loop) if t not in owned), key=name)
+    # (depth, kind, item) still to render, in reverse order
+    stack: list[tuple[int, str, Any]] = [(0, "task", t) for t in reversed(roots)]
+    while stack:
+        depth, kind, item = stack.pop()
+        indent = "  " * depth
+        if kind == "task":
+            lines.append(f"{indent}{_format_task(item, current, clock)}")
+            scopes = sorted(timeouts_of.get(item, ()), key=deadline)
+            stack.extend((depth + 1, "group", g) for g in reversed(groups_of.get(item, ())))
+            stack.extend((depth + 1, "timeout", t) for t in reversed(scopes))
+        elif kind == "group":
+            line = f"{indent}{item!r}"
+            multiplexer = item._multiplexer
+            if multiplexer is not None and len(multiplexer):
+                line += f" with {len(multiplexer)} lightweight children"
+            lines.append(line)
+            children = sorted(item._tasks, key=name)
+            stack.extend((depth + 1, "task", t) for t in reversed(children))
+        else:
+            line = f"{indent}{item!r}"
+            when = item.when()
+            if when is not None and not item.expired():
+                line += f" expires in {when - now:.3f}s"
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def print_tree(loop: AbstractEventLoop | None = None, file: TextIO | None = None) -> None:
+    """Print format_tree(loop) to file, default sys.stderr."""
+    if file is None:
+        file = sys.stderr
+    print(format_tree(loop), file=file, flush=True)